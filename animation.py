@@ -0,0 +1,132 @@
+"""Non-blocking animation of a sorting step stream on Tk's event loop.
+
+AnimationScheduler pulls steps from a generator on ``root.after`` ticks
+instead of sleeping between them, so the window keeps handling events
+while a sort runs.  Rendering is capped at a target frame rate: when the
+per-step delay is shorter than a frame, several steps are merged into a
+single frame and the renderer is flushed once.
+"""
+import time
+
+import instrumentation
+
+
+class AnimationScheduler:
+    def __init__(self, root, steps, on_step, on_frame=None, on_done=None, delay=100, fps=60):
+        """Animate ``steps``, calling ``on_step(step)`` for each one.
+
+        ``on_frame()`` runs once after every batch of steps and
+        ``on_done()`` once the stream is exhausted.  ``delay`` is the time
+        per step in milliseconds; 0 runs as fast as the frame budget allows.
+        """
+        self.root = root
+        self.steps = iter(steps)
+        self.on_step = on_step
+        self.on_frame = on_frame
+        self.on_done = on_done
+        self.delay = delay
+        self.frame_ms = 1000 / fps
+        self.steps_done = 0
+        self.paused = False
+        self.finished = False
+        self._after_id = None
+        self._budget = 0.0
+        self._last_tick = None
+        self._tick_end = None
+
+    @property
+    def running(self):
+        return self._after_id is not None
+
+    def start(self):
+        """Begin (or continue) animating on the next event loop iteration."""
+        if self.finished or self.running:
+            return
+        self.paused = False
+        self._last_tick = time.perf_counter()
+        self._tick_end = None  # Time spent paused is not idle time
+        self._budget = 1.0  # Show the first step immediately
+        self._after_id = self.root.after(0, self._tick)
+
+    def pause(self):
+        """Stop scheduling ticks; the step stream keeps its position."""
+        self.paused = True
+        self._cancel_tick()
+
+    def resume(self):
+        if self.paused:
+            self.start()
+
+    def toggle_pause(self):
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def step(self):
+        """Advance exactly one step while paused."""
+        if not self.paused:
+            self.pause()
+        self._advance(1)
+        self._flush()
+
+    def set_delay(self, delay):
+        """Change the per-step delay; takes effect from the next tick."""
+        self.delay = delay
+
+    def stop(self):
+        """Abandon the animation without calling on_done."""
+        self._cancel_tick()
+        self.finished = True
+
+    def _cancel_tick(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        self._after_id = None
+        now = time.perf_counter()
+        if self._tick_end is not None:
+            instrumentation.record("animation.idle", now - self._tick_end)  # Time handed back to Tk
+        if self.delay <= 0:
+            # Unthrottled: spend most of a frame stepping, then render.
+            deadline = now + self.frame_ms * 0.7 / 1000
+            while not self.finished and time.perf_counter() < deadline:
+                self._advance(256)
+        else:
+            self._budget += (now - self._last_tick) * 1000 / self.delay
+            due = int(self._budget)
+            if due:
+                self._budget -= due
+                # Never try to catch up more than one second of lag at once.
+                self._advance(min(due, max(1, int(1000 / self.delay))))
+        self._last_tick = now
+        self._flush()
+        if not self.finished:
+            self._after_id = self.root.after(int(max(self.frame_ms, min(self.delay, 1000))), self._tick)
+        self._tick_end = time.perf_counter()
+
+    @instrumentation.timed("animation.advance")  # Algorithm, tracing and on_step
+    def _advance(self, count):
+        on_step = self.on_step
+        done = self.steps_done
+        for _ in range(count):
+            try:
+                step = next(self.steps)
+            except StopIteration:
+                self.finished = True
+                break
+            on_step(step)
+            self.steps_done += 1
+        instrumentation.count("animation.steps", self.steps_done - done)
+
+    @instrumentation.timed("animation.frame")
+    def _flush(self):
+        if self.on_frame:
+            self.on_frame()
+        if self.finished:
+            self._cancel_tick()
+            if self.on_done:
+                on_done, self.on_done = self.on_done, None
+                on_done()
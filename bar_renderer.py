@@ -0,0 +1,205 @@
+"""Incremental canvas rendering of the sorting bars.
+
+BarRenderer creates one rectangle (and, when there is room, one value
+label) per element once, then only moves or recolors the items whose
+index was marked dirty since the last flush.  Marking is cheap and
+idempotent, so a frame that swaps the same bar many times still updates
+its canvas items once.
+
+ColumnRenderer is the large-array mode: instead of canvas items it paints
+a single PhotoImage where each pixel column aggregates the run of
+elements that falls into it, so its cost per frame is bounded by the
+canvas width rather than the array length.
+"""
+import tkinter as tk
+
+import instrumentation
+
+HIGHLIGHT_COLOR = "purple"
+MIN_LABEL_WIDTH = 14  # Bars narrower than this (px) get no value label
+LABEL_ROOM = 25  # Space (px) kept above the tallest bar for its label
+
+
+def value_scale(array, height):
+    """Return a function mapping values of array to bar heights in pixels.
+
+    The scale adapts to the data range; zero is kept as the baseline when
+    all values are positive so that bar heights stay proportional.
+    """
+    lo = min(0, min(array))
+    hi = max(array)
+    span = (hi - lo) or 1
+    return lambda value: (value - lo) * height / span
+
+
+class BarRenderer:
+    def __init__(self, canvas, color_for, width=900, height=500, margin=5):
+        self.canvas = canvas
+        self.color_for = color_for  # value -> fill color
+        self.width = width
+        self.height = height
+        self.margin = margin
+        self.array = []
+        self.bars = []
+        self.labels = []
+        self.shown = []  # Value each bar currently displays
+        self.highlighted = set()
+        self.dirty = set()
+
+    @instrumentation.timed("render.bars.load")
+    def load(self, array):
+        """Create the canvas items for array; it is read again on every flush."""
+        self.canvas.delete("all")
+        self.array = array
+        self.bars = []
+        self.labels = []
+        self.shown = list(array)
+        self.highlighted = set()
+        self.dirty = set()
+        if not array:
+            return
+        self.bar_width = (self.width - 2 * self.margin) / len(array)
+        self.scale = value_scale(array, self.height - LABEL_ROOM)
+        show_labels = self.bar_width >= MIN_LABEL_WIDTH
+        outline = "black" if self.bar_width >= 4 else ""
+        for i, value in enumerate(array):
+            x0, y0, x1, y1 = self.bar_coords(i, value)
+            self.bars.append(self.canvas.create_rectangle(x0, y0, x1, y1, fill=self.color_for(value), outline=outline))
+            if show_labels:
+                self.labels.append(self.canvas.create_text((x0 + x1) / 2, y0 - 10, text=str(value), fill="black", font=("Helvetica", 8)))
+
+    def bar_coords(self, index, value):
+        x0 = self.margin + index * self.bar_width
+        x1 = x0 + max(self.bar_width - 2, 1)
+        return x0, self.height - self.scale(value), x1, self.height
+
+    def mark(self, index):
+        """Schedule the bar at index to be redrawn on the next flush."""
+        self.dirty.add(index)
+
+    def mark_all(self):
+        self.dirty = set(range(len(self.bars)))
+
+    def highlight(self, indices):
+        """Highlight exactly the given bars, restoring the previous ones."""
+        indices = {i for i in indices if 0 <= i < len(self.bars)}
+        self.dirty |= self.highlighted ^ indices
+        self.highlighted = indices
+
+    @instrumentation.timed("render.bars.flush")
+    def flush(self):
+        """Apply all pending changes, touching each dirty item once."""
+        canvas = self.canvas
+        array = self.array
+        for i in self.dirty:
+            if i >= len(self.bars):
+                continue
+            value = array[i]
+            if value != self.shown[i]:
+                x0, y0, x1, y1 = self.bar_coords(i, value)
+                canvas.coords(self.bars[i], x0, y0, x1, y1)
+                if self.labels:
+                    canvas.coords(self.labels[i], (x0 + x1) / 2, y0 - 10)
+                    canvas.itemconfig(self.labels[i], text=str(value))
+                self.shown[i] = value
+            fill = HIGHLIGHT_COLOR if i in self.highlighted else self.color_for(value)
+            canvas.itemconfig(self.bars[i], fill=fill)
+        self.dirty.clear()
+
+    def clear(self):
+        self.load([])
+
+
+class ColumnRenderer:
+    def __init__(self, canvas, width=900, height=500, aggregate="minmax",
+                 color="#3357FF", low_color="#1A237E", background="#E0F7FA"):
+        """Render into a width x height PhotoImage.
+
+        ``aggregate`` is "minmax" (the column is drawn up to its largest
+        value, with the part below its smallest value shaded darker) or
+        "mean" (the column is drawn up to its mean value).
+        """
+        if aggregate not in ("minmax", "mean"):
+            raise ValueError(f"Unknown aggregate {aggregate!r}")
+        self.canvas = canvas
+        self.width = width
+        self.height = height
+        self.aggregate = aggregate
+        self.color = color
+        self.low_color = low_color
+        self.background = background
+        self.image = None
+        self.array = []
+        self.columns = 0
+        self.highlighted = set()
+        self.dirty = set()
+
+    @instrumentation.timed("render.columns.load")
+    def load(self, array):
+        """Paint every column of array; it is read again on every flush."""
+        self.canvas.delete("all")
+        self.array = array
+        self.highlighted = set()
+        self.dirty = set()
+        self.image = tk.PhotoImage(width=self.width, height=self.height)
+        self.canvas.create_image(0, 0, image=self.image, anchor="nw")
+        if not array:
+            self.columns = 0
+            return
+        self.columns = min(len(array), self.width)
+        self.scale = value_scale(array, self.height)
+        self.image.put(self.background, to=(0, 0, self.width, self.height))
+        self.dirty = set(range(self.columns))
+        self.flush()
+
+    def mark(self, index):
+        """Schedule the column holding index to be repainted on the next flush."""
+        self.dirty.add(index * self.columns // len(self.array))
+
+    def mark_all(self):
+        self.dirty = set(range(self.columns))
+
+    def highlight(self, indices):
+        """Highlight exactly the columns holding the given indices."""
+        n = len(self.array)
+        columns = {i * self.columns // n for i in indices if 0 <= i < n}
+        self.dirty |= self.highlighted ^ columns
+        self.highlighted = columns
+
+    @instrumentation.timed("render.columns.flush")
+    def flush(self):
+        """Repaint each dirty column once from the current array contents."""
+        n = len(self.array)
+        if not n:
+            self.dirty.clear()
+            return
+        put = self.image.put
+        height = self.height
+        for column in self.dirty:
+            # Elements i with i * columns // n == column.
+            start = -(-column * n // self.columns)
+            stop = -(-(column + 1) * n // self.columns)
+            values = self.array[start:stop]
+            x0 = column * self.width // self.columns
+            x1 = (column + 1) * self.width // self.columns
+            if self.aggregate == "mean":
+                top = self.scale(sum(values) / len(values))
+                low = 0
+            else:
+                top = self.scale(max(values))
+                low = self.scale(min(values))
+            y_top = max(0, min(height - 1, int(height - top)))
+            y_low = max(y_top, int(height - low))
+            if y_top:
+                put(self.background, to=(x0, 0, x1, y_top))
+            if column in self.highlighted:
+                put(HIGHLIGHT_COLOR, to=(x0, y_top, x1, height))
+                continue
+            if y_low > y_top:
+                put(self.color, to=(x0, y_top, x1, y_low))
+            if y_low < height:
+                put(self.low_color, to=(x0, y_low, x1, height))
+        self.dirty.clear()
+
+    def clear(self):
+        self.load([])
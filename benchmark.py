@@ -0,0 +1,232 @@
+"""Benchmark the sorting engine algorithms without the GUI.
+
+Runs every algorithm in both orders over several input sizes and
+distributions, recording wall time, step counts and peak memory, and
+writes the results as a table, CSV and/or JSON.  A saved result file can
+be used as a baseline to catch performance regressions:
+
+    python benchmark.py --sizes 1000 10000 --save-baseline baseline.json
+    python benchmark.py --sizes 1000 10000 --baseline baseline.json
+"""
+import argparse
+import csv
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from itertools import islice
+
+import numpy_backend
+import sorting_engine
+
+DISTRIBUTIONS = numpy_backend.DISTRIBUTIONS
+ORDERS = ("asc", "desc")
+FIELDS = ("algorithm", "order", "distribution", "size", "status", "seconds",
+          "compares", "swaps", "writes", "peak_kb")
+CHUNK = 1 << 16  # Steps drained between time-limit checks
+MIN_DELTA = 0.005  # Seconds; slowdowns below this are timer noise, not regressions
+
+
+def make_dataset(distribution, size, rng):
+    """Build a list of size ints with the given distribution."""
+    if distribution == "random":
+        return [rng.randint(0, size) for _ in range(size)]
+    if distribution == "sorted":
+        return list(range(size))
+    if distribution == "reversed":
+        return list(range(size, 0, -1))
+    if distribution == "few-unique":
+        return [rng.randint(0, 9) for _ in range(size)]
+    if distribution == "nearly-sorted":
+        data = list(range(size))
+        for _ in range(size // 100 + 1 if size else 0):
+            i, j = rng.randrange(size), rng.randrange(size)
+            data[i], data[j] = data[j], data[i]
+        return data
+    raise ValueError(f"Unknown distribution {distribution!r}; choose from {', '.join(DISTRIBUTIONS)}")
+
+
+def time_run(name, data, ascending, time_limit):
+    """Sort a copy of data once; return (status, seconds, [compares, swaps, writes])."""
+    array = list(data)
+    counts = [0, 0, 0]
+    steps = sorting_engine.get_algorithm(name)(array, ascending)
+    deadline = time.perf_counter() + time_limit if time_limit else None
+    start = time.perf_counter()
+    while True:
+        # Drain in chunks so the deadline check stays off the per-step path.
+        taken = 0
+        for op, _, _ in islice(steps, CHUNK):
+            counts[op] += 1
+            taken += 1
+        if taken < CHUNK:
+            break
+        if deadline and time.perf_counter() > deadline:
+            return "timeout", time.perf_counter() - start, counts
+    seconds = time.perf_counter() - start
+    status = "ok" if array == sorted(data, reverse=not ascending) else "wrong"
+    return status, seconds, counts
+
+
+def peak_memory_kb(name, data, ascending):
+    """Peak traced allocation (KiB) of one run, measured separately from timing."""
+    array = list(data)
+    tracemalloc.start()
+    try:
+        for _ in sorting_engine.get_algorithm(name)(array, ascending):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def run_benchmarks(algorithms, sizes, distributions, orders=ORDERS, repeat=3,
+                   seed=0, time_limit=None, memory=True, progress=None, backend="python"):
+    """Run the benchmark matrix and return a list of result dicts.
+
+    ``backend="numpy"`` generates the inputs with the vectorized NumPy
+    generators; the algorithms themselves always run on plain lists.
+    """
+    results = []
+    for size in sizes:
+        for distribution in distributions:
+            if backend == "numpy":
+                data = numpy_backend.make_dataset(distribution, size, seed=seed).tolist()
+            else:
+                data = make_dataset(distribution, size, random.Random(f"{seed}-{distribution}-{size}"))
+            for name in algorithms:
+                for order in orders:
+                    ascending = order == "asc"
+                    times = []
+                    for _ in range(repeat):
+                        status, seconds, counts = time_run(name, data, ascending, time_limit)
+                        times.append(seconds)
+                        if status != "ok":
+                            break
+                    result = {
+                        "algorithm": name,
+                        "order": order,
+                        "distribution": distribution,
+                        "size": size,
+                        "status": status,
+                        "seconds": round(statistics.median(times), 6),
+                        "compares": counts[sorting_engine.COMPARE],
+                        "swaps": counts[sorting_engine.SWAP],
+                        "writes": counts[sorting_engine.WRITE],
+                        "peak_kb": peak_memory_kb(name, data, ascending) if memory and status == "ok" else None,
+                    }
+                    results.append(result)
+                    if progress:
+                        progress(result)
+    return results
+
+
+def result_key(result):
+    return (result["algorithm"], result["order"], result["distribution"], result["size"])
+
+
+def compare_to_baseline(results, baseline, tolerance, min_delta=MIN_DELTA):
+    """Return a list of human-readable regressions of results against baseline.
+
+    A slowdown counts only if it exceeds both ``tolerance`` (relative) and
+    ``min_delta`` seconds, so timer noise on tiny inputs is not reported.
+    """
+    previous = {result_key(r): r for r in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None or old["status"] != "ok":
+            continue
+        label = "{} {} {} n={}".format(*result_key(result))
+        if result["status"] != "ok":
+            regressions.append(f"{label}: status ok -> {result['status']}")
+            continue
+        slowdown = result["seconds"] - old["seconds"]
+        if slowdown > old["seconds"] * tolerance and slowdown > min_delta:
+            regressions.append(f"{label}: {old['seconds']:.4f}s -> {result['seconds']:.4f}s")
+        for field in ("compares", "swaps", "writes"):
+            if result[field] > old[field]:
+                regressions.append(f"{label}: {field} {old[field]} -> {result[field]}")
+    return regressions
+
+
+def format_table(results, fields=FIELDS):
+    """Render results as a fixed-width summary table of the given fields."""
+    rows = [fields] + [tuple("-" if r[f] is None else str(r[f]) for f in fields) for r in results]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(fields))]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
+def write_csv(results, path):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def write_json(results, path):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sorting engine algorithms.")
+    parser.add_argument("--algorithms", nargs="+", default=list(sorting_engine.ALGORITHMS),
+                        choices=list(sorting_engine.ALGORITHMS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100, 1000])
+    parser.add_argument("--distributions", nargs="+", default=list(DISTRIBUTIONS), choices=DISTRIBUTIONS)
+    parser.add_argument("--orders", nargs="+", default=list(ORDERS), choices=ORDERS)
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case; the median is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--backend", default="python", choices=("python", "numpy"),
+                        help="how input datasets are generated")
+    parser.add_argument("--time-limit", type=float, default=30,
+                        help="abandon a run after this many seconds (0 for no limit)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory pass")
+    parser.add_argument("--csv", help="write results to this CSV file")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--save-baseline", metavar="PATH", help="save results as a regression baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare results against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative slowdown against the baseline (default 0.25)")
+    parser.add_argument("--min-delta", type=float, default=MIN_DELTA,
+                        help=f"ignore slowdowns smaller than this many seconds (default {MIN_DELTA})")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not print the summary table")
+    args = parser.parse_args(argv)
+    if args.backend == "numpy" and not numpy_backend.HAVE_NUMPY:
+        parser.error("--backend numpy requires NumPy to be installed")
+
+    def progress(result):
+        print("{algorithm} {order} {distribution} n={size}: {status} {seconds}s".format(**result), file=sys.stderr)
+
+    results = run_benchmarks(args.algorithms, args.sizes, args.distributions, args.orders,
+                             repeat=args.repeat, seed=args.seed, time_limit=args.time_limit,
+                             memory=not args.no_memory, progress=None if args.quiet else progress,
+                             backend=args.backend)
+    if not args.quiet:
+        print(format_table(results))
+    if args.csv:
+        write_csv(results, args.csv)
+    if args.json:
+        write_json(results, args.json)
+    if args.save_baseline:
+        write_json(results, args.save_baseline)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance, args.min_delta)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
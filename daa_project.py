@@ -1,113 +1,177 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+import queue
 import random
+import threading
 import time
 import tkinter.simpledialog as simpledialog
 
+import external_sort
+import instrumentation
+import numpy_backend
+import sorting_engine
+from animation import AnimationScheduler
+from bar_renderer import BarRenderer, ColumnRenderer
+from race import RaceWindow
+from step_trace import ReplayWindow, StepTrace
+
+LARGE_ARRAY_THRESHOLD = 2000  # Arrays longer than this use the pixel-column renderer
+BUTTON_COLUMNS = 7
+CANVAS_HEIGHT = 440  # With three rows of controls the window fits a 768-pixel screen
+MAX_TRACE_STEPS = 5_000_000  # Recording stops here (about 33 bytes per step)
+
 class SortingVisualizer:
     def __init__(self, root):
         self.root = root
         self.root.title("Number Sorting Visualizer")
-        self.root.geometry("900x700")
+        self.root.geometry("950x700")
         self.root.config(bg="#87CEEB")  # Sky blue background color
 
         self.array = []
-        self.bars = []
         self.speed = 100  # Default speed (ms)
+        self.animation = None  # AnimationScheduler of the running sort
+        self.compared = ()  # Bars compared most recently in the current frame
+        self.trace = None  # StepTrace of the most recent sort
+        self.replay = None  # Open ReplayWindow, if any
 
         # Add a project title label at the top
         project_title_label = tk.Label(root, text="Number Sorting Visualizer", font=("Helvetica", 30, "bold"), bg="#87CEEB")
-        project_title_label.pack(pady=10)
+        project_title_label.pack(pady=5)
 
         # Create a frame for the canvas and button section
         main_frame = tk.Frame(root, bg="#87CEEB")
-        main_frame.pack(pady=20)
+        main_frame.pack(pady=5)
 
         # Create canvas for drawing bars
-        self.canvas = tk.Canvas(main_frame, width=900, height=500, highlightthickness=0, bg="#E0F7FA")
+        self.canvas = tk.Canvas(main_frame, width=900, height=CANVAS_HEIGHT, highlightthickness=0, bg="#E0F7FA")
         self.canvas.grid(row=0, column=0, padx=10)
+        self.bar_renderer = BarRenderer(self.canvas, self.get_bar_color, width=900, height=CANVAS_HEIGHT)
+        self.column_renderer = ColumnRenderer(self.canvas, width=900, height=CANVAS_HEIGHT, background="#E0F7FA")
+        self.renderer = self.bar_renderer
 
         # Frame for sorting buttons
         button_frame = tk.Frame(main_frame, bg="#87CEEB")
-        button_frame.grid(row=1, column=0, pady=10)
+        button_frame.grid(row=1, column=0, pady=5)
+
+        def button(text, command, color):
+            return tk.Button(button_frame, text=text, command=command, bg=color, fg="black", font=("Helvetica", 10, "bold"))
+
+        # One algorithm selector with Asc/Desc buttons instead of a button
+        # pair per algorithm keeps the window short enough for small screens.
+        self.algorithms = {label: name for name, (label, _) in sorting_engine.ALGORITHMS.items()}
+        self.algorithm = tk.StringVar(value=next(iter(self.algorithms)))
+        algorithm_selector = ttk.Combobox(button_frame, textvariable=self.algorithm, values=list(self.algorithms),
+                                          state="readonly", width=18)
 
         # Create sorting buttons with colors and bold black text
-        sorting_buttons = [
-            ("Generate Numbers", self.generate_numbers, "#FF5733"),
-            ("Input Numbers", self.input_numbers, "#33FF57"),
-            ("Bubble Sort Asc", lambda: self.bubble_sort(ascending=True), "#3357FF"),
-            ("Bubble Sort Desc", lambda: self.bubble_sort(ascending=False), "#F3FF33"),
-            ("Selection Sort Asc", lambda: self.selection_sort(ascending=True), "#FF33A1"),
-            ("Selection Sort Desc", lambda: self.selection_sort(ascending=False), "#33FFF9"),
-            ("Quick Sort Asc", lambda: self.quick_sort(ascending=True), "#FF8C33"),
-            ("Quick Sort Desc", lambda: self.quick_sort(ascending=False), "#33FF8C"),
-            ("Merge Sort Asc", lambda: self.merge_sort(ascending=True), "#C70039"),
-            ("Merge Sort Desc", lambda: self.merge_sort(ascending=False), "#900C3F"),
-            ("Insertion Sort Asc", lambda: self.insertion_sort(ascending=True), "#581845"),
-            ("Insertion Sort Desc", lambda: self.insertion_sort(ascending=False), "#FFC300"),
-            ("Reset", self.reset, "#DAF7A6"),
+        controls = [
+            button("Generate Numbers", self.generate_numbers, "#FF5733"),
+            button("Input Numbers", self.input_numbers, "#33FF57"),
+            button("Generate Large", self.generate_large, "#FF5733"),
+            algorithm_selector,
+            button("Sort Asc", lambda: self.sort(self.algorithms[self.algorithm.get()], ascending=True), "#3357FF"),
+            button("Sort Desc", lambda: self.sort(self.algorithms[self.algorithm.get()], ascending=False), "#F3FF33"),
+            button("Race All", self.race_all, "#FF8C33"),
+            button("Sort File...", self.sort_file, "#33FFF9"),
+            button("Replay", self.replay_trace, "#C70039"),
+            button("Save Trace", self.save_trace, "#F3FF33"),
+            button("Load Trace", self.load_trace, "#33FF57"),
+            button("Reset", self.reset, "#DAF7A6"),
+            button("Pause / Resume", self.toggle_pause, "#DAF7A6"),
+            button("Step", self.step, "#33FF57"),
         ]
 
         # Add speed control buttons
         speed_buttons = [
-            ("Speed: Slow", lambda: self.set_speed(200), "#FF33E8"),
-            ("Speed: Normal", lambda: self.set_speed(100), "#33FFF6"),
-            ("Speed: Fast", lambda: self.set_speed(50), "#FFC300"),
+            button("Speed: Slow", lambda: self.set_speed(200), "#FF33E8"),
+            button("Speed: Normal", lambda: self.set_speed(100), "#33FFF6"),
+            button("Speed: Fast", lambda: self.set_speed(50), "#FFC300"),
+            button("Speed: Max", lambda: self.set_speed(0), "#FF5733"),
         ]
 
-        # Place sorting buttons in a grid layout
-        for index, (text, command, color) in enumerate(sorting_buttons):
-            btn = tk.Button(button_frame, text=text, command=command, bg=color, fg="black", font=("Helvetica", 10, "bold"))
-            btn.grid(row=index // 4, column=index % 4, padx=5, pady=5, sticky="ew")
+        # Place the controls in a grid layout
+        for index, widget in enumerate(controls):
+            widget.grid(row=index // BUTTON_COLUMNS, column=index % BUTTON_COLUMNS, padx=5, pady=5, sticky="ew")
 
-        # Place speed control buttons
-        for index, (text, command, color) in enumerate(speed_buttons):
-            btn = tk.Button(button_frame, text=text, command=command, bg=color, fg="black", font=("Helvetica", 10, "bold"))
-            btn.grid(row=2, column=index, padx=5, pady=5, sticky="ew")
+        # Place speed control buttons below the other controls
+        first_row = -(-len(controls) // BUTTON_COLUMNS)
+        for index, widget in enumerate(speed_buttons):
+            widget.grid(row=first_row + index // BUTTON_COLUMNS, column=index % BUTTON_COLUMNS, padx=5, pady=5, sticky="ew")
 
         # Configure button frame to expand evenly
-        for i in range(4):  # 4 columns for sorting buttons
-            button_frame.columnconfigure(i, weight=1)
-        for i in range(3):  # 3 columns for speed buttons
+        for i in range(BUTTON_COLUMNS):
             button_frame.columnconfigure(i, weight=1)
 
+        # Status line for background jobs such as file sorting
+        self.status_label = tk.Label(root, text="", font=("Helvetica", 10), bg="#87CEEB")
+        self.status_label.pack()
+
+        instrumentation.show_overlay(self.root)
+
     def set_speed(self, speed):
-        """Set the speed for sorting visualization."""
+        """Set the speed for sorting visualization, even mid-sort."""
         self.speed = speed
+        if self.animation:
+            self.animation.set_delay(speed)
+        if self.replay:
+            self.replay.set_delay(speed)
+
+    def toggle_pause(self):
+        """Pause or resume the running sort."""
+        if self.animation:
+            self.animation.toggle_pause()
+
+    def step(self):
+        """Advance the running sort by a single step."""
+        if self.animation:
+            self.animation.step()
+
+    def stop_animation(self):
+        """Abandon the running sort or replay, if any."""
+        if self.animation:
+            self.animation.stop()
+            self.animation = None
+        self.close_replay()
 
     def generate_numbers(self):
         """Generate a new set of random numbers."""
+        self.stop_animation()
         self.array = [random.randint(10, 100) for _ in range(30)]
         self.draw_bars()
 
+    def generate_large(self):
+        """Generate a large array of random numbers for the pixel-column renderer."""
+        size = simpledialog.askinteger("Generate Large", "How many numbers?", initialvalue=100000, minvalue=1, maxvalue=10000000)
+        if size:
+            self.stop_animation()
+            if numpy_backend.HAVE_NUMPY:
+                self.array = numpy_backend.make_dataset("random", size).tolist()
+            else:
+                self.array = [random.randint(0, size) for _ in range(size)]
+            self.draw_bars()
+
     def input_numbers(self):
         """Allow the user to input custom numbers."""
         input_str = simpledialog.askstring("Input Numbers", "Enter numbers separated by commas:")
         if input_str:
             try:
-                self.array = list(map(int, input_str.split(",")))
+                numbers = list(map(int, input_str.split(",")))
+                self.stop_animation()
+                self.array = numbers
                 self.draw_bars()
             except ValueError:
                 messagebox.showerror("Invalid Input", "Please enter valid numbers separated by commas.")
 
+    @instrumentation.timed("visualizer.draw_bars")
     def draw_bars(self):
         """Draw the bars representing the sorting array."""
         if not self.canvas or not self.array:  # Ensure canvas and array are valid
             return
-        self.canvas.delete("all")
-        self.bars = []
-
-        bar_width = 900 // len(self.array)
-        for i, value in enumerate(self.array):
-            x0 = i * bar_width + 5
-            y0 = 500 - value * 4
-            x1 = x0 + bar_width - 2
-            y1 = 500
-            bar_color = self.get_bar_color(value)
-            bar = self.canvas.create_rectangle(x0, y0, x1, y1, fill=bar_color, outline="black")
-            self.bars.append(bar)
-            # Display the bar value
-            self.canvas.create_text((x0 + x1) / 2, y0 - 10, text=str(value), fill="black", font=("Helvetica", 8))
+        if len(self.array) > LARGE_ARRAY_THRESHOLD:
+            self.renderer = self.column_renderer
+        else:
+            self.renderer = self.bar_renderer
+        self.renderer.load(self.array)
 
     def get_bar_color(self, value):
         """Get a color based on the value of the bar."""
@@ -119,146 +183,167 @@ class SortingVisualizer:
             return "#F44336"  # Red for high values
 
     def update_bars(self, indices):
-        """Update the colors of the bars during sorting."""
-        if not self.canvas or not self.bars:  # Ensure canvas and bars are valid
-            return
-        for index in indices:
-            if 0 <= index < len(self.bars):  # Ensure index is within bounds
-                self.canvas.itemconfig(self.bars[index], fill="purple")
-        self.root.update()
-        time.sleep(self.speed / 1000)  # Convert ms to seconds
-
-    def bubble_sort(self, ascending=True):
-        """Perform bubble sort and visualize the sorting process."""
-        if not self.array:
-            messagebox.showinfo("Empty Array", "Please generate numbers or input custom numbers.")
-            return
-        n = len(self.array)
-        for i in range(n):
-            for j in range(0, n - i - 1):
-                self.update_bars([j, j + 1])
-                if (ascending and self.array[j] > self.array[j + 1]) or (not ascending and self.array[j] < self.array[j + 1]):
-                    self.array[j], self.array[j + 1] = self.array[j + 1], self.array[j]
-                    self.draw_bars()
-        self.update_bars(range(n))  # Final update to show sorted array
-
-    def selection_sort(self, ascending=True):
-        """Perform selection sort and visualize the sorting process."""
-        if not self.array:
-            messagebox.showinfo("Empty Array", "Please generate numbers or input custom numbers.")
-            return
-        n = len(self.array)
-        for i in range(n):
-            min_index = i
-            for j in range(i + 1, n):
-                self.update_bars([min_index, j])
-                if (ascending and self.array[j] < self.array[min_index]) or (not ascending and self.array[j] > self.array[min_index]):
-                    min_index = j
-            self.array[i], self.array[min_index] = self.array[min_index], self.array[i]
-            self.draw_bars()
-        self.update_bars(range(n))  # Final update to show sorted array
-
-    def insertion_sort(self, ascending=True):
-        """Perform insertion sort and visualize the sorting process."""
-        if not self.array:
-            messagebox.showinfo("Empty Array", "Please generate numbers or input custom numbers.")
+        """Highlight the given bars and redraw everything marked dirty."""
+        if not self.canvas:  # Ensure canvas is valid
             return
-        n = len(self.array)
-        for i in range(1, n):
-            key = self.array[i]
-            j = i - 1
-            while j >= 0 and ((ascending and self.array[j] > key) or (not ascending and self.array[j] < key)):
-                self.update_bars([j, j + 1])
-                self.array[j + 1] = self.array[j]
-                j -= 1
-            self.array[j + 1] = key
-            self.draw_bars()
-        self.update_bars(range(n))  # Final update to show sorted array
+        self.renderer.highlight(indices)
+        self.renderer.flush()
 
-    def quick_sort(self, ascending=True):
-        """Perform quick sort and visualize the sorting process."""
+    def sort(self, name, ascending=True):
+        """Start animating the named engine algorithm on the current array."""
         if not self.array:
             messagebox.showinfo("Empty Array", "Please generate numbers or input custom numbers.")
             return
-        self._quick_sort(0, len(self.array) - 1, ascending)
+        self.stop_animation()
+        steps = sorting_engine.get_algorithm(name)(self.array, ascending)
+        try:
+            self.trace = StepTrace(self.array, name, ascending)
+        except OverflowError:
+            self.trace = None  # Traces hold int64 values; sort these without recording
+        else:
+            steps = self.trace.wrap(steps, MAX_TRACE_STEPS)
+        self.sort_started = time.perf_counter()
+        self.animation = AnimationScheduler(
+            self.root,
+            steps,
+            on_step=self.on_step,
+            on_frame=self.on_frame,
+            on_done=self.on_sort_done,
+            delay=self.speed,
+        )
+        self.animation.start()
+
+    def on_step(self, step):
+        """Record one engine step; drawing is deferred to on_frame."""
+        op, a, b = step
+        if op == sorting_engine.COMPARE:
+            self.compared = (a, b)
+        else:
+            self.renderer.mark(a)
+            if op == sorting_engine.SWAP:
+                self.renderer.mark(b)
+
+    def on_frame(self):
+        """Render the steps applied since the previous frame."""
+        self.update_bars(self.compared)
+        self.compared = ()
+
+    def on_sort_done(self):
+        self.animation = None
+        instrumentation.record("visualizer.sort", time.perf_counter() - self.sort_started)  # Wall time, delays included
         self.update_bars(range(len(self.array)))  # Final update to show sorted array
 
-    def _quick_sort(self, low, high, ascending):
-        """Helper function for quick sort."""
-        if low < high:
-            pi = self.partition(low, high, ascending)
-            self._quick_sort(low, pi - 1, ascending)
-            self._quick_sort(pi + 1, high, ascending)
-
-    def partition(self, low, high, ascending):
-        """Partition function for quick sort."""
-        pivot = self.array[high]
-        i = low - 1
-        for j in range(low, high):
-            self.update_bars([i + 1, j])
-            if (ascending and self.array[j] < pivot) or (not ascending and self.array[j] > pivot):
-                i += 1
-                self.array[i], self.array[j] = self.array[j], self.array[i]
-                self.draw_bars()
-        self.array[i + 1], self.array[high] = self.array[high], self.array[i + 1]
-        self.draw_bars()
-        return i + 1
-
-    def merge_sort(self, ascending=True):
-        """Perform merge sort and visualize the sorting process."""
+    def race_all(self):
+        """Race every algorithm on copies of the current array in parallel."""
         if not self.array:
             messagebox.showinfo("Empty Array", "Please generate numbers or input custom numbers.")
             return
-        self._merge_sort(0, len(self.array) - 1, ascending)
-        self.update_bars(range(len(self.array)))  # Final update to show sorted array
+        RaceWindow(self.root, self.array)
+
+    def sort_file(self):
+        """Sort a large file of numbers on disk with the external merge sort."""
+        input_path = filedialog.askopenfilename(
+            title="Choose a file of numbers",
+            filetypes=[("Text numbers", "*.txt *.csv"), ("Binary int64", "*.bin"), ("All files", "*.*")])
+        if not input_path:
+            return
+        output_path = filedialog.asksaveasfilename(title="Save sorted numbers as", defaultextension=".bin")
+        if not output_path:
+            return
+        input_format = "binary" if input_path.endswith(".bin") else "text"
+        output_format = "binary" if output_path.endswith(".bin") else "text"
+        self.file_progress = queue.Queue()
+        # The sort blocks, so it runs on a thread and reports through a queue.
+        threading.Thread(target=self._run_file_sort, daemon=True,
+                         args=(input_path, output_path, input_format, output_format)).start()
+        self.poll_file_sort()
+
+    def _run_file_sort(self, input_path, output_path, input_format, output_format):
+        try:
+            count = external_sort.external_sort(input_path, output_path, input_format, output_format,
+                                                progress=lambda *update: self.file_progress.put(update))
+            self.file_progress.put(("done", count, output_path))
+        except Exception as e:  # Anything, or poll_file_sort would wait forever
+            self.file_progress.put(("error", str(e) or type(e).__name__, None))
+
+    def poll_file_sort(self):
+        """Show the latest file-sort progress; keep polling until it finishes."""
+        update = None
+        while not self.file_progress.empty():
+            update = self.file_progress.get_nowait()
+            if update[0] in ("done", "error"):
+                break
+        if update is None:
+            self.root.after(100, self.poll_file_sort)
+        elif update[0] == "done":
+            self.status_label.config(text=f"Sorted {update[1]} numbers into {update[2]}")
+        elif update[0] == "error":
+            self.status_label.config(text="")
+            messagebox.showerror("Sort File", update[1])
+        else:
+            phase, done, total = update
+            percent = 100 * done // total if total else 100
+            self.status_label.config(text=f"Sorting file: {phase} {percent}%")
+            self.root.after(100, self.poll_file_sort)
+
+    def replay_trace(self, trace=None):
+        """Replay the most recent sort (or the given trace) with seek controls."""
+        trace = trace or self.trace
+        if trace is None:
+            messagebox.showinfo("Replay", "Run a sort or load a trace first.")
+            return
+        self.stop_animation()
+        if len(trace.initial) > LARGE_ARRAY_THRESHOLD:
+            self.renderer = self.column_renderer
+        else:
+            self.renderer = self.bar_renderer
+        self.replay = ReplayWindow(self.root, trace, self.renderer, delay=self.speed, on_close=self.on_replay_closed)
 
-    def _merge_sort(self, left, right, ascending):
-        """Helper function for merge sort."""
-        if left < right:
-            mid = (left + right) // 2
-            self._merge_sort(left, mid, ascending)
-            self._merge_sort(mid + 1, right, ascending)
-            self.merge(left, mid, right, ascending)
-
-    def merge(self, left, mid, right, ascending):
-        """Merge function for merge sort."""
-        left_copy = self.array[left:mid + 1]
-        right_copy = self.array[mid + 1:right + 1]
-
-        left_index, right_index = 0, 0
-        sorted_index = left
-
-        while left_index < len(left_copy) and right_index < len(right_copy):
-            self.update_bars([sorted_index])
-            if (ascending and left_copy[left_index] <= right_copy[right_index]) or (not ascending and left_copy[left_index] >= right_copy[right_index]):
-                self.array[sorted_index] = left_copy[left_index]
-                left_index += 1
-            else:
-                self.array[sorted_index] = right_copy[right_index]
-                right_index += 1
-            sorted_index += 1
-            self.draw_bars()
+    def close_replay(self):
+        if self.replay:
+            self.replay.close()
 
-        while left_index < len(left_copy):
-            self.update_bars([sorted_index])
-            self.array[sorted_index] = left_copy[left_index]
-            left_index += 1
-            sorted_index += 1
+    def on_replay_closed(self):
+        self.replay = None
+        if self.array:
             self.draw_bars()
+        else:
+            self.renderer.clear()
 
-        while right_index < len(right_copy):
-            self.update_bars([sorted_index])
-            self.array[sorted_index] = right_copy[right_index]
-            right_index += 1
-            sorted_index += 1
-            self.draw_bars()
+    def save_trace(self):
+        if self.trace is None:
+            messagebox.showinfo("Save Trace", "Run a sort first.")
+            return
+        path = filedialog.asksaveasfilename(title="Save trace as", defaultextension=".strc",
+                                            filetypes=[("Step traces", "*.strc")])
+        if path:
+            try:
+                self.trace.save(path)
+            except OSError as e:
+                messagebox.showerror("Save Trace", str(e))
+                return
+            if self.trace.truncated:
+                messagebox.showwarning("Save Trace", f"Only the first {len(self.trace)} steps were recorded; "
+                                                     "the saved trace stops before the sort finished.")
+
+    def load_trace(self):
+        path = filedialog.askopenfilename(title="Load trace", filetypes=[("Step traces", "*.strc"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            trace = StepTrace.load(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Load Trace", str(e))
+            return
+        self.trace = trace
+        self.replay_trace(trace)
 
     def reset(self):
         """Reset the visualizer and clear the array."""
+        self.stop_animation()
         self.array = []
-        self.bars = []  # Clear the bar list as well
         if self.canvas:  # Check if the canvas still exists
-            self.canvas.delete("all")
+            self.renderer.clear()
 
 if __name__ == "__main__":
     root = tk.Tk()
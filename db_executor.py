@@ -0,0 +1,134 @@
+"""Run Database calls on a background thread so the Tk mainloop never blocks.
+
+DBExecutor owns a worker thread with its own sqlite3 connection (SQLite
+connections must stay on the thread that made them).  The UI submits
+requests by Database method name; results are queued back and delivered
+to callbacks when the UI thread calls poll(), typically from a
+``root.after`` loop.
+
+Requests submitted with a ``key`` supersede earlier ones with the same
+key: a queued request is skipped, a running query is interrupted, and a
+finished result is dropped, so only the latest search or page load for
+a view ever reaches its callback.
+"""
+import queue
+import sqlite3
+import threading
+import time
+
+import instrumentation
+
+from employee_db import Database
+
+
+class DBExecutor:
+    def __init__(self, db, on_error=None, **pragmas):
+        """Open db on a new worker thread.
+
+        ``on_error(exception)`` handles failures of requests submitted
+        without an errback.
+        """
+        self.on_error = on_error
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.pending = 0  # Submitted requests whose callbacks have not run yet
+        self._latest = {}  # key -> generation of the newest request with that key
+        self._lock = threading.Lock()
+        self._running = None  # (key, generation) of the request being executed
+        self._con = None
+        self._ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(db, pragmas), name="db-executor", daemon=True)
+        self.thread.start()
+        self._ready.wait()
+        if self._startup_error:
+            raise self._startup_error
+
+    @property
+    def busy(self):
+        return self.pending > 0
+
+    def submit(self, method, *args, callback=None, errback=None, key=None, **kwargs):
+        """Queue ``Database.method(*args, **kwargs)`` on the worker thread.
+
+        method may also be a function, called as ``method(database, *args,
+        **kwargs)`` for work that spans several Database calls.
+
+        ``callback(result)`` or ``errback(exception)`` runs on the thread
+        that calls poll().
+        """
+        generation = None if key is None else self.cancel(key)
+        self.pending += 1
+        self.requests.put((method, args, kwargs, callback, errback, key, generation, time.perf_counter()))
+
+    def cancel(self, key):
+        """Supersede every outstanding request with this key; return the new generation."""
+        with self._lock:
+            generation = self._latest.get(key, 0) + 1
+            self._latest[key] = generation
+            if self._running and self._running[0] == key:
+                # Abort the superseded query; a no-op if it just finished.
+                self._con.interrupt()
+        return generation
+
+    def _current(self, key, generation):
+        return key is None or self._latest.get(key) == generation
+
+    def _run(self, db, pragmas):
+        try:
+            database = Database(db, **pragmas)
+        except Exception as e:  # Anything, or __init__ would wait forever
+            self._startup_error = e
+            self._ready.set()
+            return
+        self._startup_error = None
+        self._con = database.con
+        self.has_fts = database.has_fts
+        self._ready.set()
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+            method, args, kwargs, callback, errback, key, generation, submitted = request
+            with self._lock:
+                if not self._current(key, generation):
+                    self.results.put((None, None, key, generation, submitted))
+                    continue
+                self._running = (key, generation)
+            try:
+                if callable(method):
+                    value = method(database, *args, **kwargs)
+                else:
+                    value = getattr(database, method)(*args, **kwargs)
+                outcome = (callback, value)
+            except sqlite3.OperationalError as e:
+                if not self._current(key, generation):
+                    outcome = (None, None)  # Interrupted because it was superseded
+                else:
+                    outcome = (errback, e)
+            except Exception as e:
+                outcome = (errback, e)
+            with self._lock:
+                self._running = None
+            self.results.put((*outcome, key, generation, submitted))
+        database.close()
+
+    def poll(self):
+        """Deliver finished results to their callbacks; call from the UI thread."""
+        while True:
+            try:
+                handler, value, key, generation, submitted = self.results.get_nowait()
+            except queue.Empty:
+                return
+            self.pending -= 1
+            instrumentation.record("db.round_trip", time.perf_counter() - submitted)  # Queue wait + query + delivery
+            if not self._current(key, generation):
+                continue
+            if isinstance(value, Exception) and handler is None:
+                handler = self.on_error
+            if handler:
+                handler(value)
+
+    def close(self):
+        """Finish queued requests, then stop the worker and its connection."""
+        self.requests.put(None)
+        self.thread.join()
@@ -0,0 +1,456 @@
+"""SQLite storage for the Employee Management System.
+
+Kept free of any GUI imports so that command-line tools can use the
+Database class without Tk, PIL or tkcalendar installed.
+
+The schema is versioned with ``PRAGMA user_version``: MIGRATIONS[i]
+upgrades a database from version i to i + 1, and Database() applies any
+that are pending when it opens a file.
+"""
+import re
+import sqlite3
+import unicodedata
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import date, datetime
+
+from instrumentation import Cursor, timed_query
+
+HAVE_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+COLUMNS = ("id", "name", "age", "doj", "email", "gender", "contact", "address")
+GENDERS = ("Male", "Female")
+DATE_FORMATS = ("%d-%m-%Y", "%d/%m/%Y")  # Accepted besides ISO when converting old dates
+
+
+class Employee(namedtuple("Employee", COLUMNS)):
+    """One employees row: a tuple with named fields and no per-row __dict__."""
+    __slots__ = ()
+
+
+def _employee_row(cursor, row):
+    return Employee._make(row)
+
+
+# Connection tuning applied by Database() unless overridden.
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",  # Readers do not block the writer; commits append to the log
+    "synchronous": "NORMAL",  # With WAL, fsync at checkpoints instead of every commit
+    "cache_size": -16000,  # Negative means KiB: a 16 MB page cache
+    "mmap_size": 64 * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+
+
+def _create_employees(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS employees(
+            id INTEGER PRIMARY KEY,
+            name TEXT,
+            age TEXT,
+            doj TEXT,
+            email TEXT,
+            gender TEXT,
+            contact TEXT,
+            address TEXT
+        )
+    """)
+
+
+SEARCH_INDEX_SQL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS employees_fts USING fts5(
+        name, email, contact, address,
+        content='employees', content_rowid='id', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS employees_fts_insert AFTER INSERT ON employees BEGIN
+        INSERT INTO employees_fts(rowid, name, email, contact, address)
+        VALUES (new.id, new.name, new.email, new.contact, new.address);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employees_fts_delete AFTER DELETE ON employees BEGIN
+        INSERT INTO employees_fts(employees_fts, rowid, name, email, contact, address)
+        VALUES ('delete', old.id, old.name, old.email, old.contact, old.address);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employees_fts_update AFTER UPDATE ON employees BEGIN
+        INSERT INTO employees_fts(employees_fts, rowid, name, email, contact, address)
+        VALUES ('delete', old.id, old.name, old.email, old.contact, old.address);
+        INSERT INTO employees_fts(rowid, name, email, contact, address)
+        VALUES (new.id, new.name, new.email, new.contact, new.address);
+    END""",
+    "INSERT INTO employees_fts(employees_fts) VALUES ('rebuild')",
+]
+
+
+def _add_search_indexes(cur):
+    """B-tree indexes for filtered/sorted columns and an FTS5 search index."""
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_employees_name ON employees(name)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_employees_email ON employees(email)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_employees_doj ON employees(doj)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_employees_gender ON employees(gender)")
+    _add_fts(cur)
+
+
+def _add_fts(cur):
+    if not fts5_available(cur):
+        return  # search() falls back to LIKE
+    # External-content table: the text lives only in employees, the index
+    # in employees_fts, and the triggers keep the two in step.  executescript()
+    # would commit the migration's transaction, so statements run one by one.
+    for sql in SEARCH_INDEX_SQL:
+        cur.execute(sql)
+
+
+def _typed_columns(cur):
+    """Rebuild employees with typed, checked columns and unique emails.
+
+    Values that cannot be converted, and emails that repeat an earlier
+    employee's, are stored as NULL and recorded in employees_rejected so
+    nothing is lost silently.
+    """
+    cur.execute("""
+        CREATE TABLE employees_typed(
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            age INTEGER CHECK (age BETWEEN 1 AND 149),
+            doj TEXT CHECK (doj IS date(doj, '+0 days')),  -- date() alone passes 2020-02-30
+            email TEXT CHECK (email LIKE '%_@_%'),
+            gender TEXT CHECK (gender IN ('Male', 'Female')),
+            contact TEXT CHECK (contact GLOB '[0-9+]*' AND substr(contact, 2) NOT GLOB '*[^0-9]*'),
+            address TEXT
+        )
+    """)
+    cur.execute("DROP INDEX IF EXISTS idx_employees_email")
+    cur.execute("CREATE UNIQUE INDEX idx_employees_email ON employees_typed(email COLLATE NOCASE)")
+    cur.execute("CREATE TABLE IF NOT EXISTS employees_rejected(employee_id INTEGER, column TEXT, value TEXT)")
+    insert = cur.connection.cursor()
+    for row in cur.connection.execute("SELECT * FROM employees"):
+        row = list(row)
+        row[1] = row[1] or ""
+        for index, convert in ((2, normalize_age), (3, normalize_date), (4, normalize_email),
+                               (5, normalize_gender), (6, normalize_contact)):
+            if row[index] is None:
+                continue
+            try:
+                row[index] = convert(row[index])
+            except ValueError:
+                insert.execute("INSERT INTO employees_rejected VALUES (?, ?, ?)", (row[0], COLUMNS[index], row[index]))
+                row[index] = None
+        try:
+            insert.execute("INSERT INTO employees_typed VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+        except sqlite3.IntegrityError:  # Duplicate email
+            insert.execute("INSERT INTO employees_rejected VALUES (?, 'email', ?)", (row[0], row[4]))
+            row[4] = None
+            insert.execute("INSERT INTO employees_typed VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+    # Dropping the old table drops its indexes and FTS triggers too.
+    cur.execute("DROP TABLE employees")
+    cur.execute("ALTER TABLE employees_typed RENAME TO employees")
+    cur.execute("CREATE INDEX idx_employees_name ON employees(name)")
+    cur.execute("CREATE INDEX idx_employees_doj ON employees(doj)")
+    cur.execute("CREATE INDEX idx_employees_gender ON employees(gender)")
+    _add_fts(cur)
+
+
+# Summary tables for reporting.py, one row per group, kept current by
+# triggers so reports never scan employees.  NULL group keys are stored
+# as '' (gender, month) or -1 (age band) so the upsert can find them.
+SUMMARY_SQL = [
+    "CREATE TABLE IF NOT EXISTS headcount_by_gender(gender TEXT PRIMARY KEY, headcount INTEGER NOT NULL) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS joins_by_month(month TEXT PRIMARY KEY, joins INTEGER NOT NULL) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS headcount_by_age_band(band INTEGER PRIMARY KEY, headcount INTEGER NOT NULL)",
+    # Covering indexes: rebuilding a summary reads only its index.
+    "CREATE INDEX IF NOT EXISTS idx_employees_age ON employees(age)",
+    """CREATE TRIGGER IF NOT EXISTS employees_summary_insert AFTER INSERT ON employees BEGIN
+        INSERT INTO headcount_by_gender VALUES (coalesce(new.gender, ''), 1)
+            ON CONFLICT(gender) DO UPDATE SET headcount = headcount + 1;
+        INSERT INTO joins_by_month VALUES (coalesce(substr(new.doj, 1, 7), ''), 1)
+            ON CONFLICT(month) DO UPDATE SET joins = joins + 1;
+        INSERT INTO headcount_by_age_band VALUES (coalesce(new.age / 10 * 10, -1), 1)
+            ON CONFLICT(band) DO UPDATE SET headcount = headcount + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employees_summary_delete AFTER DELETE ON employees BEGIN
+        UPDATE headcount_by_gender SET headcount = headcount - 1 WHERE gender = coalesce(old.gender, '');
+        UPDATE joins_by_month SET joins = joins - 1 WHERE month = coalesce(substr(old.doj, 1, 7), '');
+        UPDATE headcount_by_age_band SET headcount = headcount - 1 WHERE band = coalesce(old.age / 10 * 10, -1);
+        DELETE FROM headcount_by_gender WHERE gender = coalesce(old.gender, '') AND headcount = 0;
+        DELETE FROM joins_by_month WHERE month = coalesce(substr(old.doj, 1, 7), '') AND joins = 0;
+        DELETE FROM headcount_by_age_band WHERE band = coalesce(old.age / 10 * 10, -1) AND headcount = 0;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employees_summary_gender AFTER UPDATE OF gender ON employees
+    WHEN old.gender IS NOT new.gender BEGIN
+        UPDATE headcount_by_gender SET headcount = headcount - 1 WHERE gender = coalesce(old.gender, '');
+        DELETE FROM headcount_by_gender WHERE gender = coalesce(old.gender, '') AND headcount = 0;
+        INSERT INTO headcount_by_gender VALUES (coalesce(new.gender, ''), 1)
+            ON CONFLICT(gender) DO UPDATE SET headcount = headcount + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employees_summary_doj AFTER UPDATE OF doj ON employees
+    WHEN substr(old.doj, 1, 7) IS NOT substr(new.doj, 1, 7) BEGIN
+        UPDATE joins_by_month SET joins = joins - 1 WHERE month = coalesce(substr(old.doj, 1, 7), '');
+        DELETE FROM joins_by_month WHERE month = coalesce(substr(old.doj, 1, 7), '') AND joins = 0;
+        INSERT INTO joins_by_month VALUES (coalesce(substr(new.doj, 1, 7), ''), 1)
+            ON CONFLICT(month) DO UPDATE SET joins = joins + 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS employees_summary_age AFTER UPDATE OF age ON employees
+    WHEN old.age / 10 IS NOT new.age / 10 BEGIN
+        UPDATE headcount_by_age_band SET headcount = headcount - 1 WHERE band = coalesce(old.age / 10 * 10, -1);
+        DELETE FROM headcount_by_age_band WHERE band = coalesce(old.age / 10 * 10, -1) AND headcount = 0;
+        INSERT INTO headcount_by_age_band VALUES (coalesce(new.age / 10 * 10, -1), 1)
+            ON CONFLICT(band) DO UPDATE SET headcount = headcount + 1;
+    END""",
+]
+
+# Recompute the summaries from scratch with GROUP BY queries.
+REBUILD_SUMMARY_SQL = [
+    "DELETE FROM headcount_by_gender",
+    "DELETE FROM joins_by_month",
+    "DELETE FROM headcount_by_age_band",
+    "INSERT INTO headcount_by_gender SELECT coalesce(gender, ''), COUNT(*) FROM employees GROUP BY 1",
+    "INSERT INTO joins_by_month SELECT coalesce(substr(doj, 1, 7), ''), COUNT(*) FROM employees GROUP BY 1",
+    "INSERT INTO headcount_by_age_band SELECT coalesce(age / 10 * 10, -1), COUNT(*) FROM employees GROUP BY 1",
+]
+
+
+def _add_summary_tables(cur):
+    for sql in SUMMARY_SQL + REBUILD_SUMMARY_SQL:
+        cur.execute(sql)
+
+
+MIGRATIONS = [
+    _create_employees,
+    _add_search_indexes,
+    _typed_columns,
+    _add_summary_tables,
+]
+
+
+def normalize_age(value):
+    text = str(value).strip()
+    if not text.isdigit() or not 0 < int(text) < 150:
+        raise ValueError(f"age {value!r} is not a whole number of years")
+    return int(text)
+
+
+def normalize_date(value):
+    """Return value as an ISO date (YYYY-MM-DD)."""
+    text = str(value).strip()
+    try:
+        return date.fromisoformat(text).isoformat()
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            pass
+    raise ValueError(f"date of joining {value!r} is not YYYY-MM-DD")
+
+
+def normalize_email(value):
+    text = str(value).strip()
+    local, at, domain = text.partition("@")
+    if not (local and at and domain):
+        raise ValueError(f"email {value!r} is not an address")
+    return text
+
+
+def normalize_gender(value):
+    text = str(value).strip().capitalize()
+    if text not in GENDERS:
+        raise ValueError(f"gender {value!r} is not one of {', '.join(GENDERS)}")
+    return text
+
+
+def normalize_contact(value):
+    """Keep the digits of a phone number and a leading +."""
+    text = str(value).strip()
+    digits = re.sub(r"\D", "", text)
+    if not digits:
+        raise ValueError(f"contact {value!r} has no digits")
+    return "+" + digits if text.startswith("+") else digits
+
+
+def fts5_available(cur):
+    options = {row[0] for row in cur.execute("PRAGMA compile_options")}
+    return "ENABLE_FTS5" in options
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query matching every word as a prefix."""
+    words = re.findall(r"[^\W_]+", text)
+    return " AND ".join('"{}"*'.format(word) for word in words)
+
+
+def _words(text):
+    # Like FTS5's default unicode61 tokenizer: case- and accent-insensitive; "_" splits words.
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return re.findall(r"[^\W_]+", "".join(c for c in text if not unicodedata.combining(c)))
+
+
+def search_matches(row, text, fts=True):
+    """Whether Database.search(text) would return row, evaluated in Python.
+
+    Mirrors the FTS prefix query (or the LIKE fallback when fts is false)
+    closely enough to narrow down results that are already in memory.
+    """
+    if not fts:
+        return text.casefold() in str(row.name).casefold()
+    words = _words(text)
+    if not words:
+        return False
+    tokens = _words(" ".join(str(value) for value in (row.name, row.email, row.contact, row.address)))
+    return all(any(token.startswith(word) for token in tokens) for word in words)
+
+
+class Database:
+    def __init__(self, db, **pragmas):
+        # isolation_level=None leaves transaction control to us: each
+        # statement outside transaction() commits on its own, and
+        # transaction() groups many statements into one commit.
+        self.con = sqlite3.connect(db, isolation_level=None)
+        self.cur = self.con.cursor(Cursor)
+        self.rows = self.con.cursor(Cursor)  # For queries returning whole employees
+        self.rows.row_factory = _employee_row
+        self._depth = 0
+        for name, value in {**DEFAULT_PRAGMAS, **pragmas}.items():
+            if value is not None:
+                self.cur.execute(f"PRAGMA {name}={value}")
+        self.migrate()
+        self.has_fts = self.cur.execute(
+            "SELECT 1 FROM sqlite_master WHERE name='employees_fts'").fetchone() is not None
+
+    @property
+    def schema_version(self):
+        return self.cur.execute("PRAGMA user_version").fetchone()[0]
+
+    def migrate(self):
+        """Apply pending MIGRATIONS, each in its own transaction."""
+        for version in range(self.schema_version, len(MIGRATIONS)):
+            with self.transaction():
+                MIGRATIONS[version](self.cur)
+                self.cur.execute(f"PRAGMA user_version={version + 1}")
+
+    @contextmanager
+    def transaction(self):
+        """Unit of work: everything inside commits together or not at all.
+
+        Nested uses join the outermost transaction.
+        """
+        if self._depth == 0:
+            self.cur.execute("BEGIN IMMEDIATE")
+        self._depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._depth -= 1
+            if self._depth == 0:
+                self.con.rollback()
+            raise
+        self._depth -= 1
+        if self._depth == 0:
+            self.con.commit()
+
+    @timed_query
+    def insert(self, name, age, doj, email, gender, contact, address):
+        """Insert an employee and return the stored row."""
+        values = (name, age, doj, email, gender, contact, address)
+        if HAVE_RETURNING:
+            self.rows.execute("INSERT INTO employees VALUES (NULL, ?, ?, ?, ?, ?, ?, ?) RETURNING *", values)
+            return self.rows.fetchone()
+        self.rows.execute("INSERT INTO employees VALUES (NULL, ?, ?, ?, ?, ?, ?, ?)", values)
+        return self.get(self.rows.lastrowid)
+
+    @timed_query
+    def get(self, id):
+        self.rows.execute("SELECT * FROM employees WHERE id=?", (id,))
+        return self.rows.fetchone()
+
+    @timed_query
+    def insert_many(self, rows):
+        """Insert (name, age, doj, email, gender, contact, address) rows in one transaction."""
+        with self.transaction():
+            self.cur.executemany("INSERT INTO employees VALUES (NULL, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    @timed_query
+    def fetch(self):
+        self.rows.execute("SELECT * FROM employees")
+        rows = self.rows.fetchall()
+        return rows
+
+    @timed_query
+    def count(self):
+        return self.cur.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+
+    def iter_rows(self, batch_size=1000):
+        """Yield every employee in id order without loading them all at once."""
+        cur = self.con.cursor()
+        cur.row_factory = _employee_row
+        cur.execute("SELECT * FROM employees ORDER BY id")
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                return
+            yield from rows
+
+    @timed_query
+    def fetch_page(self, after_id=0, limit=200, before_id=None):
+        """Up to limit employees in id order, by keyset rather than OFFSET.
+
+        With before_id, returns the page immediately before that id
+        (still in ascending id order).
+        """
+        if before_id is not None:
+            self.rows.execute("SELECT * FROM employees WHERE id < ? ORDER BY id DESC LIMIT ?", (before_id, limit))
+            return self.rows.fetchall()[::-1]
+        self.rows.execute("SELECT * FROM employees WHERE id > ? ORDER BY id LIMIT ?", (after_id, limit))
+        return self.rows.fetchall()
+
+    @timed_query
+    def remove(self, id):
+        """Delete an employee; return whether a row was deleted."""
+        self.cur.execute("DELETE FROM employees WHERE id=?", (id,))
+        return self.cur.rowcount > 0
+
+    @timed_query
+    def remove_many(self, ids):
+        """Delete the employees with the given ids in one transaction."""
+        with self.transaction():
+            self.cur.executemany("DELETE FROM employees WHERE id=?", ((id,) for id in ids))
+
+    @timed_query
+    def update(self, id, name, age, doj, email, gender, contact, address):
+        """Update an employee and return the stored row (None if id is unknown)."""
+        values = (name, age, doj, email, gender, contact, address, id)
+        if HAVE_RETURNING:
+            self.rows.execute(
+                "UPDATE employees SET name=?, age=?, doj=?, email=?, gender=?, contact=?, address=? WHERE id=? RETURNING *",
+                values)
+            return self.rows.fetchone()
+        self.rows.execute(
+            "UPDATE employees SET name=?, age=?, doj=?, email=?, gender=?, contact=?, address=? WHERE id=?",
+            values)
+        return self.get(id)
+
+    @timed_query
+    def update_many(self, rows):
+        """Apply (id, name, age, doj, email, gender, contact, address) rows in one transaction."""
+        with self.transaction():
+            self.cur.executemany(
+                "UPDATE employees SET name=?, age=?, doj=?, email=?, gender=?, contact=?, address=? WHERE id=?",
+                ((*row[1:], row[0]) for row in rows))
+
+    @timed_query
+    def search(self, text, limit=None):
+        """Employees whose name, email, contact or address has a word starting
+        with each word of text, best matches first."""
+        limit_sql = "" if limit is None else f" LIMIT {int(limit)}"
+        if self.has_fts:
+            query = fts_query(text)
+            if not query:
+                return []  # Only punctuation, so no word to match
+            self.rows.execute(
+                "SELECT e.* FROM employees_fts JOIN employees e ON e.id = employees_fts.rowid "
+                "WHERE employees_fts MATCH ? ORDER BY employees_fts.rank" + limit_sql, (query,))
+        else:
+            self.rows.execute("SELECT * FROM employees WHERE name LIKE ?" + limit_sql, ('%' + text + '%',))
+        return self.rows.fetchall()
+
+    def close(self):
+        self.con.close()
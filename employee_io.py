@@ -0,0 +1,284 @@
+"""Streaming bulk import and export of employees as CSV, JSON or JSON Lines.
+
+Files are read and written a record at a time, and rows reach the
+database in batches of ``batch_size`` (one transaction per batch), so
+memory use stays bounded however large the file is.
+
+    python employee_io.py import staff.csv
+    python employee_io.py export staff.jsonl --db Employee.db
+
+CSV headers are matched to the employee fields case-insensitively,
+ignoring spaces and punctuation ("D.O.J" and "Contact No" both work);
+an "id" column is ignored, since imported employees get new ids.  JSON
+input is either an array or one object per line, and each record is an
+object with those keys or a list in field order.  A JSON Lines line
+that does not parse is rejected like any other invalid record; a bad
+record in an array stops the import, as the rest cannot be located.
+
+``progress(done, total)`` is called after each batch: bytes of the input
+for imports, rows for exports.
+"""
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import re
+import sqlite3
+import sys
+
+from employee_db import (COLUMNS, Database, normalize_age, normalize_contact, normalize_date,
+                         normalize_email, normalize_gender)
+
+FIELDS = ("name", "age", "doj", "email", "gender", "contact", "address")
+FORMATS = ("csv", "json", "jsonl")
+HEADER_ALIASES = {"contactno": "contact", "dateofjoining": "doj", "employeeid": "id"}
+BATCH_SIZE = 5000
+MAX_REPORTED_ERRORS = 100  # Rejected rows listed in an ImportResult; the rest are only counted
+JSON_BLOCK = 1 << 16  # Characters read from a JSON file at a time
+MAX_JSON_RECORD = 1 << 20  # Characters an array record may span before the file is refused
+
+
+class ImportResult:
+    def __init__(self):
+        self.imported = 0
+        self.rejected = 0
+        self.errors = []  # (record number, message) for the first MAX_REPORTED_ERRORS rejects
+
+    def reject(self, number, message):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((number, message))
+
+    def __str__(self):
+        return f"Imported {self.imported} employees, rejected {self.rejected}"
+
+
+def guess_format(path):
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension == "ndjson":
+        return "jsonl"
+    if extension not in FORMATS:
+        raise ValueError(f"Cannot tell the format of {path}; choose from {', '.join(FORMATS)}")
+    return extension
+
+
+def validate(record):
+    """Return a record as a tuple in FIELDS order, or raise ValueError."""
+    if isinstance(record, dict):
+        values = [record.get(field) for field in FIELDS]
+    elif isinstance(record, (list, tuple)) and len(record) == len(FIELDS):
+        values = list(record)
+    else:
+        raise ValueError(f"expected an object or a list of {len(FIELDS)} values")
+    name, age, doj, email, gender, contact, address = ("" if v is None else str(v).strip() for v in values)
+    if not name:
+        raise ValueError("name is empty")
+    return (name, normalize_age(age), normalize_date(doj), normalize_email(email),
+            normalize_gender(gender), normalize_contact(contact), address)
+
+
+def _insert_batch(db, batch, numbers, result):
+    try:
+        db.insert_many(batch)
+        result.imported += len(batch)
+    except sqlite3.IntegrityError:
+        # Some email is already taken: insert row by row, skipping the clashes.
+        with db.transaction():
+            for number, row in zip(numbers, batch):
+                try:
+                    db.insert(*row)
+                    result.imported += 1
+                except sqlite3.IntegrityError as e:
+                    result.reject(number, f"email {row[3]!r} is already used ({e})")
+
+
+def _field_name(header):
+    key = re.sub(r"[^a-z0-9]", "", header.lower())
+    return HEADER_ALIASES.get(key, key)
+
+
+def read_csv(f):
+    """Yield one dict per CSV row, keyed by field name."""
+    reader = csv.reader(f)
+    header = [_field_name(column) for column in next(reader, [])]
+    missing = set(FIELDS) - set(header)
+    if missing:
+        raise ValueError(f"CSV header has no column for {', '.join(sorted(missing))}")
+    for row in reader:
+        if row:
+            yield dict(zip(header, row))
+
+
+def read_json(f):
+    """Yield the records of a JSON array or of JSON Lines, parsing incrementally.
+
+    A JSON Lines line that does not parse is yielded as a ValueError, so
+    the caller can reject it and go on.  A bad or oversized array record
+    raises ValueError, since nothing after it can be trusted.
+    """
+    first = f.read(1)
+    while first.isspace():
+        first = f.read(1)
+    if first == "[":
+        yield from _read_json_array(f)
+    elif first:
+        yield from _read_json_lines(itertools.chain([first + f.readline()], f))
+
+
+def _read_json_lines(lines):
+    for line in lines:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield ValueError(f"not valid JSON ({e})")
+
+
+def _read_json_array(f):
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    while True:
+        # Skip whitespace and the separators between records.
+        while position < len(buffer) and (buffer[position].isspace() or buffer[position] == ","):
+            position += 1
+        if position < len(buffer):
+            if buffer[position] == "]":
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                pass  # Probably cut off at the end of the buffer
+            else:
+                if end < len(buffer):
+                    yield record
+                    position = end
+                    continue
+        if len(buffer) - position > MAX_JSON_RECORD:
+            raise ValueError(f"JSON array has a record that is not valid JSON "
+                             f"or is longer than {MAX_JSON_RECORD} characters")
+        block = f.read(JSON_BLOCK)
+        if not block:
+            if position < len(buffer):
+                try:
+                    record, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"JSON array has a record that is not valid JSON ({e})") from None
+                yield record
+                position = end
+                continue
+            raise ValueError("JSON array is not closed")
+        buffer = buffer[position:] + block
+        position = 0
+
+
+def import_employees(db, path, fmt=None, batch_size=BATCH_SIZE, progress=None):
+    """Validate and insert every record of path; return an ImportResult.
+
+    Invalid records, and records whose email is already used, are skipped
+    and reported; each batch of valid ones is inserted in its own
+    transaction.
+    """
+    fmt = fmt or guess_format(path)
+    result = ImportResult()
+    total = os.path.getsize(path)
+    with open(path, "rb") as raw:
+        f = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+        records = read_csv(f) if fmt == "csv" else read_json(f)
+        batch = []
+        numbers = []
+        for number, record in enumerate(records, 1):
+            if isinstance(record, ValueError):  # A JSON line that did not parse
+                result.reject(number, str(record))
+                continue
+            try:
+                batch.append(validate(record))
+            except ValueError as e:
+                result.reject(number, str(e))
+                continue
+            numbers.append(number)
+            if len(batch) >= batch_size:
+                _insert_batch(db, batch, numbers, result)
+                batch = []
+                numbers = []
+                if progress:
+                    progress(raw.tell(), total)
+        if batch:
+            _insert_batch(db, batch, numbers, result)
+    if progress:
+        progress(total, total)
+    return result
+
+
+def export_employees(db, path, fmt=None, batch_size=BATCH_SIZE, progress=None):
+    """Write every employee to path; return how many were written."""
+    fmt = fmt or guess_format(path)
+    total = db.count()
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+        elif fmt == "json":
+            f.write("[")
+        for row in db.iter_rows(batch_size):
+            if fmt == "csv":
+                writer.writerow(row)
+            else:
+                record = json.dumps(row._asdict())
+                if fmt == "json":
+                    f.write(",\n" if count else "\n")
+                    f.write(record)
+                else:
+                    f.write(record + "\n")
+            count += 1
+            if progress and not count % batch_size:
+                progress(count, total)
+        if fmt == "json":
+            f.write("\n]\n")
+    if progress:
+        progress(count, count)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import or export employees in bulk.")
+    parser.add_argument("action", choices=("import", "export"))
+    parser.add_argument("file")
+    parser.add_argument("--db", default="Employee.db", help="database file (default Employee.db)")
+    parser.add_argument("--format", choices=FORMATS, help="file format (default: from the extension)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    last = [None]
+
+    def progress(done, total):
+        percent = 100 * done // total if total else 100
+        if last[0] != percent:
+            last[0] = percent
+            print(f"\r{args.action}: {percent:3d}%", end="" if percent < 100 else "\n", file=sys.stderr)
+
+    db = Database(args.db)
+    try:
+        if args.action == "import":
+            result = import_employees(db, args.file, args.format, args.batch_size, progress)
+            print(result)
+            for number, message in result.errors:
+                print(f"  record {number}: {message}", file=sys.stderr)
+            if result.rejected > len(result.errors):
+                print(f"  ... and {result.rejected - len(result.errors)} more", file=sys.stderr)
+        else:
+            count = export_employees(db, args.file, args.format, args.batch_size, progress)
+            print(f"Exported {count} employees to {args.file}")
+    except ValueError as e:
+        print(f"{args.action} failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
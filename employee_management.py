@@ -1,56 +1,40 @@
-import sqlite3
 from tkinter import *
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from tkcalendar import DateEntry
 from PIL import Image, ImageTk
 
-class Database:
-    def __init__(self, db):
-        self.con = sqlite3.connect(db)
-        self.cur = self.con.cursor()
-        sql = """
-        CREATE TABLE IF NOT EXISTS employees(
-            id INTEGER PRIMARY KEY,
-            name TEXT,
-            age TEXT,
-            doj TEXT,
-            email TEXT,
-            gender TEXT,
-            contact TEXT,
-            address TEXT
-        )
-        """
-        self.cur.execute(sql)
-        self.con.commit()
-
-    def insert(self, name, age, doj, email, gender, contact, address):
-        self.cur.execute("INSERT INTO employees VALUES (NULL, ?, ?, ?, ?, ?, ?, ?)",
-                         (name, age, doj, email, gender, contact, address))
-        self.con.commit()
-
-    def fetch(self):
-        self.cur.execute("SELECT * FROM employees")
-        rows = self.cur.fetchall()
-        return rows
-
-    def remove(self, id):
-        self.cur.execute("DELETE FROM employees WHERE id=?", (id,))
-        self.con.commit()
-
-    def update(self, id, name, age, doj, email, gender, contact, address):
-        self.cur.execute(
-            "UPDATE employees SET name=?, age=?, doj=?, email=?, gender=?, contact=?, address=? WHERE id=?",
-            (name, age, doj, email, gender, contact, address, id))
-        self.con.commit()
-
-    def search(self, name):
-        self.cur.execute("SELECT * FROM employees WHERE name LIKE ?", ('%' + name + '%',))
-        return self.cur.fetchall()
+import sqlite3
+
+import employee_io
+import instrumentation
+import reporting
+from db_executor import DBExecutor
+from employee_db import Employee
+from search_cache import SearchCache
+
+PAGE_SIZE = 200  # Rows fetched per keyset page
+MAX_LOADED_ROWS = 1000  # Rows kept in the Treeview; pages far from the view are dropped
+SEARCH_LIMIT = 1000  # Most search results shown at once
+POLL_INTERVAL = 50  # ms between checks for finished database requests
+SEARCH_DELAY = 250  # ms of no typing before a live search runs
+
+
+def tree_values(row):
+    # Tk would show a NULL column as "None".
+    return ["" if value is None else value for value in row]
+
 
 class EmployeeManagementApp:
     def __init__(self, root):
-        self.db = Database("Employee.db")
         self.root = root
+        # All database work runs on a worker thread; results come back
+        # through poll_db() so slow queries never block the mainloop.
+        self.db = DBExecutor("Employee.db", on_error=self.show_db_error)
+        self.search_cache = SearchCache(fts=self.db.has_fts)
+        self.search_job = None
+        self.last_search = None
+        self.io_progress = None  # (action, done, total), set from the database thread
+        self.employees = {}  # id -> Employee for every row in the Treeview; Tk mangles values such as "+91..."
         self.root.title("Employee Management System")
         self.root.geometry("1920x1080+0+0")
         self.root.config(bg="#2c3e50")
@@ -79,14 +63,22 @@ class EmployeeManagementApp:
         # Search Frame
         self.create_search_frame()
 
+        # Dashboard
+        self.create_dashboard()
+
         # Table Frame
         self.create_table_frame()
 
         # Load Logout Icon
         self.load_logout_icon()
 
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        instrumentation.show_overlay(self.root)
+        self.poll_db()
+
         # Populate the table
         self.display_all()
+        self.refresh_dashboard()
 
     def create_entry_fields(self):
         lblName = Label(self.entries_frame, text="Name", font=("Calibri", 16), bg="#535c68", fg="white")
@@ -136,16 +128,36 @@ class EmployeeManagementApp:
         btnDelete.grid(row=0, column=2, padx=10)
         btnClear = Button(btn_frame, command=self.clear_all, text="Clear Details", width=15, font=("Calibri", 16, "bold"), fg="white", bg="#f39c12", bd=0)
         btnClear.grid(row=0, column=3, padx=10)
+        btnImport = Button(btn_frame, command=self.import_employees, text="Import File", width=15, font=("Calibri", 16, "bold"), fg="white", bg="#8e44ad", bd=0)
+        btnImport.grid(row=0, column=4, padx=10)
+        btnExport = Button(btn_frame, command=self.export_employees, text="Export File", width=15, font=("Calibri", 16, "bold"), fg="white", bg="#8e44ad", bd=0)
+        btnExport.grid(row=0, column=5, padx=10)
 
     def create_search_frame(self):
         search_frame = Frame(self.entries_frame, bg="#535c68")
         search_frame.grid(row=7, column=0, columnspan=4, padx=10, pady=10, sticky="w")
-        lblSearch = Label(search_frame, text="Search by Name:", font=("Calibri", 16), bg="#535c68", fg="white")
+        lblSearch = Label(search_frame, text="Search:", font=("Calibri", 16), bg="#535c68", fg="white")
         lblSearch.grid(row=0, column=0, padx=10, pady=5, sticky="w")
         self.txtSearch = Entry(search_frame, font=("Calibri", 16), width=30)
         self.txtSearch.grid(row=0, column=1, padx=10, pady=5, sticky="w")
+        self.txtSearch.bind("<KeyRelease>", self.on_search_typed)
         btnSearch = Button(search_frame, command=self.search_employee, text="Search", width=15, font=("Calibri", 16, "bold"), fg="white", bg="#2980b9", bd=0)
         btnSearch.grid(row=0, column=2, padx=10)
+        self.busy_label = Label(search_frame, text="", font=("Calibri", 14, "italic"), bg="#535c68", fg="#f1c40f")
+        self.busy_label.grid(row=0, column=3, padx=10, sticky="w")
+
+    def create_dashboard(self):
+        dashboard_frame = Frame(self.entries_frame, bg="#535c68")
+        dashboard_frame.grid(row=1, column=4, rowspan=7, padx=30, pady=5, sticky="nw")
+        lblDashboard = Label(dashboard_frame, text="Dashboard", font=("Calibri", 16, "bold"), bg="#535c68", fg="white")
+        lblDashboard.pack(anchor="w")
+        self.dashboard_label = Label(dashboard_frame, text="", font=("Consolas", 12), justify=LEFT, anchor="nw", bg="#535c68", fg="white")
+        self.dashboard_label.pack(anchor="w")
+
+    def refresh_dashboard(self):
+        # Reads only the trigger-maintained summary tables: one row per group.
+        self.db.submit(reporting.dashboard, key="dashboard",
+                       callback=lambda report: self.dashboard_label.config(text=reporting.format_report(report)))
 
     def create_table_frame(self):
         tree_frame = Frame(self.root)
@@ -163,8 +175,16 @@ class EmployeeManagementApp:
         self.tv.heading("Contact", text="Contact")
         self.tv.heading("Address", text="Address")
         self.tv['show'] = 'headings'
+        # Only a window of rows is loaded; scrolling near either end pages in more.
+        self.scrollbar = ttk.Scrollbar(tree_frame, orient=VERTICAL, command=self.tv.yview)
+        self.scrollbar.pack(side=RIGHT, fill=Y)
+        self.tv.configure(yscrollcommand=self.on_tree_scroll)
         self.tv.pack(fill=BOTH, expand=True)
         self.tv.bind("<ButtonRelease-1>", self.select_employee)
+        self.more_before = False
+        self.more_after = False
+        self.page_pending = False
+        self.searching = False
 
     def load_logout_icon(self):
         try:
@@ -179,65 +199,325 @@ class EmployeeManagementApp:
             logout_btn = Button(self.root, text="Logout", command=self.logout, bd=0, bg="#2c3e50", font=("Calibri", 14), fg="white")
             logout_btn.place(x=1800, y=20)
 
+    def poll_db(self):
+        # Reschedule first, so a callback that raises cannot stop the polling.
+        self.poll_job = self.root.after(POLL_INTERVAL, self.poll_db)
+        self.db.poll()
+        busy = self.db.busy
+        text = "Working..." if busy else ""
+        if busy and self.io_progress:
+            action, done, total = self.io_progress
+            text = f"{action} {100 * done // total if total else 100}%"
+        self.busy_label.config(text=text)
+        self.root.config(cursor="watch" if busy else "")
+
+    def show_db_error(self, error):
+        messagebox.showerror("Database Error", str(error))
+
     def display_all(self):
-        for i in self.tv.get_children():
-            self.tv.delete(i)
-        for row in self.db.fetch():
-            self.tv.insert("", "end", values=row)
+        self.cancel_live_search()
+        self.remove_rows(*self.tv.get_children())
+        self.searching = False
+        self.last_search = ""
+        self.more_before = False
+        self.more_after = True
+        self.load_next_page()
+
+    def on_tree_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.page_pending:
+            return
+        if float(last) > 0.9 and self.more_after:
+            self.page_pending = True
+            self.root.after_idle(self.load_next_page)
+        elif float(first) < 0.1 and self.more_before:
+            self.page_pending = True
+            self.root.after_idle(self.load_previous_page)
+
+    # Page loads share the "view" key with searches, so whichever the user
+    # asked for last wins and earlier results are dropped unseen.  Paging
+    # stays blocked (page_pending) until the requested page has arrived.
+
+    def load_next_page(self):
+        self.page_pending = True
+        children = self.tv.get_children()
+        last_id = int(children[-1]) if children else 0
+        self.db.submit("fetch_page", after_id=last_id, limit=PAGE_SIZE, key="view",
+                       callback=self.show_next_page, errback=self.page_failed)
+
+    @instrumentation.timed("view.next_page")
+    def show_next_page(self, rows):
+        self.page_pending = False
+        children = self.tv.get_children()
+        first_visible = self.tv.yview()[0]  # Fraction of children above the view
+        self.more_after = len(rows) == PAGE_SIZE
+        inserted = 0
+        for row in rows:
+            if not self.tv.exists(row.id):  # May have been shown by an add while loading
+                self.insert_row("end", row)
+                inserted += 1
+        overflow = len(children) + inserted - MAX_LOADED_ROWS
+        if overflow > 0:
+            top = children[min(round(first_visible * len(children)), len(children) - 1)]
+            self.remove_rows(*children[:overflow])
+            self.more_before = True
+            if self.tv.exists(top):
+                self.tv.see(top)  # Keep the rows the user was looking at in view
+
+    def load_previous_page(self):
+        children = self.tv.get_children()
+        if not children:
+            self.page_pending = False
+            return
+        self.page_pending = True
+        self.db.submit("fetch_page", before_id=int(children[0]), limit=PAGE_SIZE, key="view",
+                       callback=self.show_previous_page, errback=self.page_failed)
+
+    @instrumentation.timed("view.previous_page")
+    def show_previous_page(self, rows):
+        self.page_pending = False
+        children = self.tv.get_children()
+        self.more_before = len(rows) == PAGE_SIZE
+        for index, row in enumerate(rows):
+            self.insert_row(index, row)
+        overflow = len(children) + len(rows) - MAX_LOADED_ROWS
+        if overflow > 0:
+            self.remove_rows(*children[-overflow:])
+            self.more_after = True
+        if rows:
+            self.tv.see(children[0])  # Keep the rows the user was looking at in view
+
+    def page_failed(self, error):
+        self.page_pending = False
+        self.show_db_error(error)
 
     def add_employee(self):
-        if self.name.get() == "" or self.age.get() == "" or self.doj.get() == "" or self.email.get() == "" or self.gender.get() == "" or self.contact.get() == "":
-            messagebox.showerror("Error", "Please fill all fields.")
+        values = self.form_values()
+        if not values:
             return
-        self.db.insert(self.name.get(), self.age.get(), self.doj.get(), self.email.get(), self.gender.get(), self.contact.get(), self.txtAddress.get("1.0", END))
+        self.search_cache.invalidate()
+        self.db.submit("insert", *values, callback=self.employee_added, errback=self.save_failed)
+
+    def employee_added(self, row):
         messagebox.showinfo("Success", "Employee added successfully!")
-        self.display_all()
-        self.clear_all()
+        self.refresh_dashboard()
+        self.show_inserted(row)
+        self.finish_edit()
 
     def update_employee(self):
         selected_item = self.tv.focus()
         if not selected_item:
             messagebox.showwarning("Select an Employee", "Please select an employee to update.")
             return
-        id = self.tv.item(selected_item)['values'][0]
-        self.db.update(id, self.name.get(), self.age.get(), self.doj.get(), self.email.get(), self.gender.get(), self.contact.get(), self.txtAddress.get("1.0", END))
+        values = self.form_values()
+        if not values:
+            return
+        id = int(selected_item)
+        self.search_cache.invalidate()
+        self.db.submit("update", id, *values, callback=self.employee_updated, errback=self.save_failed)
+
+    def form_values(self):
+        """The form as a validated, normalized record, or None after an error message."""
+        if self.name.get() == "" or self.age.get() == "" or self.doj.get() == "" or self.email.get() == "" or self.gender.get() == "" or self.contact.get() == "":
+            messagebox.showerror("Error", "Please fill all fields.")
+            return None
+        try:
+            return employee_io.validate((self.name.get(), self.age.get(), self.doj.get(), self.email.get(), self.gender.get(), self.contact.get(), self.txtAddress.get("1.0", END)))
+        except ValueError as e:
+            messagebox.showerror("Invalid Details", f"The {e}.")
+            return None
+
+    def save_failed(self, error):
+        if isinstance(error, sqlite3.IntegrityError) and "email" in str(error):
+            messagebox.showerror("Error", "Another employee already has this email.")
+        else:
+            self.show_db_error(error)
+
+    def employee_updated(self, row):
         messagebox.showinfo("Success", "Employee updated successfully!")
-        self.display_all()
-        self.clear_all()
+        self.refresh_dashboard()
+        self.show_updated(row)
+        self.finish_edit()
 
     def delete_employee(self):
         selected_item = self.tv.focus()
         if not selected_item:
             messagebox.showwarning("Select an Employee", "Please select an employee to delete.")
             return
-        id = self.tv.item(selected_item)['values'][0]
-        self.db.remove(id)
+        id = int(selected_item)
+        self.search_cache.invalidate()
+        self.db.submit("remove", id, callback=lambda removed: self.employee_deleted(id))
+
+    def employee_deleted(self, id):
         messagebox.showinfo("Success", "Employee deleted successfully!")
+        self.refresh_dashboard()
+        self.show_removed(id)
+        self.finish_edit()
+
+    def finish_edit(self):
+        """Clear the form after an edit; search results are fetched again,
+        since the edit may have changed which employees match."""
+        self.clear_details()
+        if self.searching:
+            self.run_search(self.last_search)
+
+    # Each edit touches only its own Treeview item (the iid is the employee
+    # id), so the rest of the view, its order and the selection are kept.
+
+    @instrumentation.timed("view.edit")
+    def show_inserted(self, row):
+        # Rows are listed by id and a new id is the largest, so it belongs at
+        # the end -- but only if the loaded window already reaches the end.
+        if self.searching or self.more_after:
+            return
+        self.insert_row("end", row)
+        children = self.tv.get_children()
+        if len(children) > MAX_LOADED_ROWS:
+            self.remove_rows(children[0])
+            self.more_before = True
+
+    @instrumentation.timed("view.edit")
+    def show_updated(self, row):
+        if row and self.tv.exists(row.id):
+            self.tv.item(row.id, values=tree_values(row))
+            self.employees[row.id] = row
+
+    @instrumentation.timed("view.edit")
+    def show_removed(self, id):
+        if self.tv.exists(id):
+            self.remove_rows(id)
+
+    def insert_row(self, index, row):
+        self.tv.insert("", index, iid=row.id, values=tree_values(row))
+        self.employees[row.id] = row
+
+    def remove_rows(self, *iids):
+        self.tv.delete(*iids)
+        for iid in iids:
+            del self.employees[int(iid)]
+
+    # Imports and exports run as a single request on the database thread;
+    # their progress is only stored there and shown by poll_db().
+
+    def import_employees(self):
+        path = filedialog.askopenfilename(title="Import Employees", filetypes=[("Employee files", "*.csv *.json *.jsonl"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            fmt = employee_io.guess_format(path)
+        except ValueError as e:
+            messagebox.showerror("Import", str(e))
+            return
+        self.search_cache.invalidate()
+        self.io_progress = ("Importing", 0, 1)
+        self.db.submit(employee_io.import_employees, path, fmt,
+                       progress=lambda done, total: setattr(self, "io_progress", ("Importing", done, total)),
+                       callback=self.employees_imported, errback=self.io_failed)
+
+    def employees_imported(self, result):
+        self.io_progress = None
+        details = "".join(f"\nRecord {number}: {message}" for number, message in result.errors[:10])
+        messagebox.showinfo("Import", f"{result}.{details}")
         self.display_all()
-        self.clear_all()
+        self.refresh_dashboard()
+
+    def export_employees(self):
+        path = filedialog.asksaveasfilename(title="Export Employees", defaultextension=".csv", filetypes=[("CSV", "*.csv"), ("JSON", "*.json"), ("JSON Lines", "*.jsonl")])
+        if not path:
+            return
+        try:
+            fmt = employee_io.guess_format(path)
+        except ValueError as e:
+            messagebox.showerror("Export", str(e))
+            return
+        self.io_progress = ("Exporting", 0, 1)
+        self.db.submit(employee_io.export_employees, path, fmt,
+                       progress=lambda done, total: setattr(self, "io_progress", ("Exporting", done, total)),
+                       callback=lambda count: self.employees_exported(count, path), errback=self.io_failed)
+
+    def employees_exported(self, count, path):
+        self.io_progress = None
+        messagebox.showinfo("Export", f"Exported {count} employees to {path}")
+
+    def io_failed(self, error):
+        self.io_progress = None
+        self.show_db_error(error)
 
     def search_employee(self):
         if self.txtSearch.get() == "":
-            messagebox.showwarning("Search Field Empty", "Please enter a name to search.")
+            messagebox.showwarning("Search Field Empty", "Please enter a search term.")
             return
-        for i in self.tv.get_children():
-            self.tv.delete(i)
-        for row in self.db.search(self.txtSearch.get()):
-            self.tv.insert("", "end", values=row)
+        self.cancel_live_search()
+        self.run_search(self.txtSearch.get())
+
+    # Live search: each keystroke restarts a short timer and the search runs
+    # once typing pauses.  Repeated terms, and terms that extend a cached
+    # one, are answered from search_cache without touching the database.
+
+    def on_search_typed(self, event):
+        self.cancel_live_search()
+        self.search_job = self.root.after(SEARCH_DELAY, self.live_search)
+
+    def cancel_live_search(self):
+        if self.search_job:
+            self.root.after_cancel(self.search_job)
+            self.search_job = None
+
+    def live_search(self):
+        self.search_job = None
+        text = self.txtSearch.get()
+        if text == self.last_search:
+            return  # Keys such as arrows and Shift do not change the term
+        if text == "":
+            self.display_all()
+        else:
+            self.run_search(text)
+
+    def run_search(self, text):
+        self.last_search = text
+        self.searching = True
+        self.more_before = self.more_after = False  # Results are ranked, not paged by id
+        self.page_pending = False
+        rows = self.search_cache.get(text)
+        if rows is not None:
+            self.db.cancel("view")  # Drop any page or search still in flight
+            self.show_results(rows)
+            return
+        version = self.search_cache.version
+
+        def searched(rows):
+            self.search_cache.put(text, rows, len(rows) < SEARCH_LIMIT, version)
+            self.show_results(rows)
+
+        self.db.submit("search", text, limit=SEARCH_LIMIT, key="view", callback=searched)
+
+    @instrumentation.timed("view.search_results")
+    def show_results(self, rows):
+        self.remove_rows(*self.tv.get_children())
+        for row in rows:
+            self.insert_row("end", row)
 
     def select_employee(self, event):
         selected_item = self.tv.focus()
-        values = self.tv.item(selected_item)['values']
-        self.name.set(values[1])
-        self.age.set(values[2])
-        self.doj.set(values[3])
-        self.email.set(values[4])
-        self.gender.set(values[5])
-        self.contact.set(values[6])
+        if not selected_item:
+            return
+        employee = Employee._make(tree_values(self.employees[int(selected_item)]))
+        self.name.set(employee.name)
+        self.age.set(employee.age)
+        self.doj.set(employee.doj)
+        self.email.set(employee.email)
+        self.gender.set(employee.gender)
+        self.contact.set(employee.contact)
         self.txtAddress.delete("1.0", END)
-        self.txtAddress.insert(END, values[7])
+        self.txtAddress.insert(END, employee.address)
 
     def clear_all(self):
+        self.clear_details()
+        self.txtSearch.delete(0, END)
+        if self.searching:
+            self.display_all()  # An empty search box lists everyone
+
+    def clear_details(self):
         self.name.set("")
         self.age.set("")
         self.doj.set("")
@@ -245,12 +525,16 @@ class EmployeeManagementApp:
         self.gender.set("")
         self.contact.set("")
         self.txtAddress.delete("1.0", END)
-        self.txtSearch.delete(0, END)
 
     def logout(self):
         # Logout functionality (currently does nothing)
         messagebox.showinfo("Logout", "Logout button clicked, but functionality is disabled.")
 
+    def close(self):
+        self.root.after_cancel(self.poll_job)
+        self.db.close()
+        self.root.destroy()
+
 if __name__ == "__main__":
     root = Tk()
     app = EmployeeManagementApp(root)
@@ -0,0 +1,268 @@
+"""External merge sort for integer files larger than memory.
+
+The input is streamed in chunks (text: integers separated by commas or
+whitespace; binary: native int64), chunks are sorted in parallel worker
+processes and spilled to temporary run files, and the runs are combined
+with k-way heap merges into the output.  At most MAX_MERGE_RUNS runs are
+open at once; when there are more, groups of them are first merged into
+longer intermediate runs, as many passes as needed.  A binary output file
+is written through a memory map.  Memory use is bounded by
+``memory_limit``, which sizes both the chunks in flight and the per-run
+merge buffers.
+
+    python external_sort.py numbers.txt sorted.bin --memory 64M --workers 4
+
+``progress(phase, done, total)`` is called as work completes, with phase
+"read" (bytes), "sort" (chunks) or "merge" (values).
+"""
+import argparse
+import heapq
+import mmap
+import os
+import sys
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import sorting_engine
+
+INT_BYTES = 8  # Run files and binary input/output hold int64 values
+LIST_ITEM_BYTES = 40  # Rough cost of one int held in a Python list
+MIN_CHUNK = 1024
+MAX_MERGE_RUNS = 128  # Run files merged (and open) at once; stays well under the open-file limit
+MIN_MERGE_BUFFER = 64  # Values buffered per run; fewer runs are merged at once on small budgets
+READ_BLOCK = 1 << 20  # Bytes read from a text file at a time
+FORMATS = ("text", "binary")
+
+
+def parse_memory(text):
+    """Parse a size such as 65536, 512K, 64M or 2G into bytes."""
+    text = text.strip().upper()
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def read_chunks(path, fmt, chunk_size, progress=None):
+    """Yield lists of at most chunk_size ints read from path."""
+    total = os.path.getsize(path)
+    with open(path, "rb") as f:
+        if fmt == "binary":
+            while True:
+                values = array("q")
+                try:
+                    values.fromfile(f, chunk_size)
+                except EOFError:
+                    pass  # Short final chunk; fromfile keeps what it read
+                if progress:
+                    progress("read", f.tell(), total)
+                if not values:
+                    return
+                yield values.tolist()
+        elif fmt == "text":
+            chunk = []
+            tail = b""
+            while True:
+                block = f.read(READ_BLOCK)
+                data = tail + block
+                if block:
+                    # Hold back a token that may continue in the next block.
+                    cut = max(data.rfind(b","), data.rfind(b" "), data.rfind(b"\n"), data.rfind(b"\t"))
+                    data, tail = data[:cut + 1], data[cut + 1:]
+                try:
+                    chunk.extend(map(int, data.replace(b",", b" ").split()))
+                except ValueError:
+                    raise ValueError(f"{path} contains a value that is not an integer") from None
+                while len(chunk) >= chunk_size:
+                    yield chunk[:chunk_size]
+                    del chunk[:chunk_size]
+                if progress:
+                    progress("read", f.tell(), total)
+                if not block:
+                    break
+            if chunk:
+                yield chunk
+        else:
+            raise ValueError(f"Unknown format {fmt!r}; choose from {', '.join(FORMATS)}")
+
+
+def sort_run(values, run_path, ascending=True, algorithm=None):
+    """Sort one chunk and spill it to run_path as int64; return its length.
+
+    ``algorithm`` names a sorting_engine algorithm; by default the
+    built-in sort (itself a natural-run merge sort) is used.
+    """
+    if algorithm:
+        for _ in sorting_engine.get_algorithm(algorithm)(values, ascending):
+            pass
+    else:
+        values.sort(reverse=not ascending)
+    try:
+        run = array("q", values)
+    except OverflowError:
+        raise ValueError("values must fit in a signed 64-bit integer") from None
+    with open(run_path, "wb") as f:
+        run.tofile(f)
+    return len(run)
+
+
+def read_run(path, buffer_size):
+    """Stream the int64 values of a run file, buffer_size values at a time."""
+    with open(path, "rb") as f:
+        while True:
+            values = array("q")
+            try:
+                values.fromfile(f, buffer_size)
+            except EOFError:
+                pass
+            if not values:
+                return
+            yield from values
+
+
+def external_sort(input_path, output_path, input_format="text", output_format="binary",
+                  ascending=True, memory_limit=64 << 20, workers=None, algorithm=None,
+                  tmp_dir=None, progress=None):
+    """Sort the integers in input_path into output_path; return how many were sorted."""
+    workers = workers or os.cpu_count() or 1
+    # Up to `workers` chunks are being sorted while one more is being read.
+    chunk_size = max(MIN_CHUNK, memory_limit // (LIST_ITEM_BYTES * (workers + 1)))
+    with tempfile.TemporaryDirectory(prefix="external_sort_", dir=tmp_dir) as scratch:
+        runs = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = []
+            for index, chunk in enumerate(read_chunks(input_path, input_format, chunk_size, progress)):
+                run_path = os.path.join(scratch, f"run{index:06d}.bin")
+                pending.append(pool.submit(sort_run, chunk, run_path, ascending, algorithm))
+                runs.append(run_path)
+                del chunk
+                if len(pending) >= workers:
+                    # Wait for the oldest chunk so memory in flight stays bounded.
+                    pending.pop(0).result()
+                    if progress:
+                        progress("sort", len(runs) - len(pending), len(runs))
+            for future in pending:
+                future.result()
+            if progress:
+                progress("sort", len(runs), len(runs))
+
+        if output_format not in FORMATS:
+            raise ValueError(f"Unknown format {output_format!r}; choose from {', '.join(FORMATS)}")
+        total = sum(os.path.getsize(path) for path in runs) // INT_BYTES
+        # Each open run and the output batch get one buffer of the budget.
+        fan_in = max(2, min(MAX_MERGE_RUNS, memory_limit // (2 * INT_BYTES * MIN_MERGE_BUFFER) - 1))
+        buffer_size = max(1, memory_limit // (2 * INT_BYTES * (fan_in + 1)))
+        passes = 1
+        count = len(runs)
+        while count > fan_in:
+            count = -(-count // fan_in)
+            passes += 1
+        done = 0  # Values merged in earlier passes
+
+        def merge_progress(phase, position, _total):
+            progress(phase, done + position, total * passes)
+
+        report = merge_progress if progress else None
+        level = 0
+        while len(runs) > fan_in:
+            level += 1
+            merged_runs = []
+            for start in range(0, len(runs), fan_in):
+                run_path = os.path.join(scratch, f"pass{level}_run{start // fan_in:06d}.bin")
+                done += _merge_runs(runs[start:start + fan_in], run_path, ascending, buffer_size, report)
+                merged_runs.append(run_path)
+            runs = merged_runs
+        merged = heapq.merge(*(read_run(path, buffer_size) for path in runs), reverse=not ascending)
+        if output_format == "binary":
+            _write_binary(merged, output_path, total, buffer_size, report)
+        else:
+            _write_text(merged, output_path, total, buffer_size, report)
+    return total
+
+
+def _merge_runs(paths, run_path, ascending, buffer_size, progress):
+    """Merge run files into one longer run, deleting them; return its length."""
+    merged = heapq.merge(*(read_run(path, buffer_size) for path in paths), reverse=not ascending)
+    position = 0
+    with open(run_path, "wb") as f:
+        for batch in _batches(merged, buffer_size):
+            batch.tofile(f)
+            position += len(batch)
+            if progress:
+                progress("merge", position, None)
+    for path in paths:
+        os.remove(path)
+    return position
+
+
+def _batches(values, size):
+    batch = array("q")
+    for value in values:
+        batch.append(value)
+        if len(batch) == size:
+            yield batch
+            batch = array("q")
+    if batch:
+        yield batch
+
+
+def _write_binary(merged, output_path, total, buffer_size, progress):
+    with open(output_path, "wb+") as f:
+        f.truncate(total * INT_BYTES)
+        if not total:
+            return
+        with mmap.mmap(f.fileno(), total * INT_BYTES) as mapped:
+            view = memoryview(mapped).cast("B").cast("q")
+            position = 0
+            for batch in _batches(merged, buffer_size):
+                view[position:position + len(batch)] = batch
+                position += len(batch)
+                if progress:
+                    progress("merge", position, total)
+            view.release()
+
+
+def _write_text(merged, output_path, total, buffer_size, progress):
+    with open(output_path, "w") as f:
+        position = 0
+        for batch in _batches(merged, buffer_size):
+            f.write("\n".join(map(str, batch)))
+            f.write("\n")
+            position += len(batch)
+            if progress:
+                progress("merge", position, total)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sort a large file of integers with bounded memory.")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--input-format", default="text", choices=FORMATS)
+    parser.add_argument("--output-format", default="binary", choices=FORMATS)
+    parser.add_argument("--desc", action="store_true", help="sort in descending order")
+    parser.add_argument("--memory", default="64M", help="memory budget, e.g. 512K, 64M, 2G (default 64M)")
+    parser.add_argument("--workers", type=int, help="sorting processes (default: CPU count)")
+    parser.add_argument("--algorithm", choices=list(sorting_engine.ALGORITHMS),
+                        help="engine algorithm for sorting chunks (default: built-in sort)")
+    parser.add_argument("--tmp-dir", help="directory for temporary run files")
+    args = parser.parse_args(argv)
+
+    last = {}
+
+    def progress(phase, done, total):
+        percent = 100 * done // total if total else 100
+        if last.get(phase) != percent:
+            last[phase] = percent
+            print(f"\r{phase}: {percent:3d}%", end="" if percent < 100 else "\n", file=sys.stderr)
+
+    count = external_sort(args.input, args.output, args.input_format, args.output_format,
+                          ascending=not args.desc, memory_limit=parse_memory(args.memory),
+                          workers=args.workers, algorithm=args.algorithm, tmp_dir=args.tmp_dir,
+                          progress=progress)
+    print(f"Sorted {count} numbers into {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
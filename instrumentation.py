@@ -0,0 +1,271 @@
+"""Opt-in timing, counters and a slow-query log for both apps.
+
+Off unless the APP_STATS environment variable is set (to anything but
+"0") or ``--stats`` is on the command line:
+
+    APP_STATS=1 python employee_management.py
+    python daa_project.py --stats
+
+The switch is read once at import.  While off, ``timed`` hands back the
+function it decorates and ``timer`` returns a shared do-nothing context
+manager, so instrumented code runs as if uninstrumented.
+
+While on, every timing feeds a latency histogram (count, total, min,
+max and p50/p95/p99 over a bounded sample), ``count`` bumps named
+counters, and Database methods decorated with ``timed_query`` log the
+SQL they ran, with its EXPLAIN QUERY PLAN, when they take longer than
+SLOW_QUERY_MS.  Only the SQL text is logged, never its parameters, so
+employee details stay out of the log.  Everything is written as JSON to
+APP_STATS_FILE (default stats.json) at exit, and ``show_overlay`` adds a
+live stats window.
+"""
+import atexit
+import contextlib
+import functools
+import json
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+
+ENV_VAR = "APP_STATS"
+FILE_ENV_VAR = "APP_STATS_FILE"
+SLOW_QUERY_MS = 50
+MAX_SAMPLES = 10000  # Per histogram; percentiles are estimated from a uniform sample
+MAX_TRACED_STATEMENTS = 20  # SQL statements kept per slow query log entry
+MAX_SLOW_QUERIES = 200
+OVERLAY_INTERVAL = 1000  # ms between overlay refreshes
+
+enabled = os.environ.get(ENV_VAR, "0") not in ("", "0") or "--stats" in sys.argv
+
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.samples = []
+        self._random = random.Random(0)  # Keeps the app's own random sequence untouched
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(seconds)
+        else:
+            # Reservoir sampling: every value seen so far is equally likely to be kept.
+            slot = self._random.randrange(self.count)
+            if slot < MAX_SAMPLES:
+                self.samples[slot] = seconds
+
+    def summary(self):
+        """Milliseconds, rounded to microseconds."""
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "total_ms": _ms(self.total),
+            "mean_ms": _ms(self.total / self.count) if self.count else 0.0,
+            "min_ms": _ms(self.min) if self.count else 0.0,
+            "p50_ms": _ms(_percentile(ordered, 50)),
+            "p95_ms": _ms(_percentile(ordered, 95)),
+            "p99_ms": _ms(_percentile(ordered, 99)),
+            "max_ms": _ms(self.max),
+        }
+
+
+def _percentile(ordered, p):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 3)
+
+
+_lock = threading.Lock()  # The database thread records too
+counters = {}
+histograms = {}
+slow_queries = []
+
+
+def count(name, n=1):
+    if enabled:
+        with _lock:
+            counters[name] = counters.get(name, 0) + n
+
+
+def record(name, seconds):
+    if enabled:
+        with _lock:
+            histogram = histograms.get(name)
+            if histogram is None:
+                histogram = histograms[name] = Histogram()
+            histogram.add(seconds)
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+
+
+_NO_TIMER = contextlib.nullcontext()
+
+
+def timer(name):
+    """Context manager timing its body into the named histogram."""
+    return _Timer(name) if enabled else _NO_TIMER
+
+
+def timed(name):
+    """Decorator timing every call into the named histogram."""
+    def decorate(func):
+        if not enabled:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+class _TracedCursor(sqlite3.Cursor):
+    """While ``statements`` is a dict, adds each SQL statement run to it,
+    mapped to its parameters (kept only to explain the query)."""
+    statements = None
+
+    def execute(self, sql, parameters=()):
+        self._trace(sql, parameters)
+        return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._trace(sql, None)  # The parameters may be a one-shot iterator
+        return super().executemany(sql, seq_of_parameters)
+
+    def _trace(self, sql, parameters):
+        if self.statements is not None and len(self.statements) < MAX_TRACED_STATEMENTS:
+            self.statements.setdefault(sql, parameters)
+
+
+# Cursor class for Database; plain sqlite3 cursors while off.
+Cursor = _TracedCursor if enabled else sqlite3.Cursor
+
+
+def timed_query(func):
+    """Decorator for Database methods: time them as "db.<method>" and log
+    the SQL that slow calls ran on db.cur and db.rows, with its query plan."""
+    if not enabled:
+        return func
+    name = "db." + func.__name__
+
+    @functools.wraps(func)
+    def wrapper(db, *args, **kwargs):
+        cursors = (db.cur, db.rows)
+        outermost = db.cur.statements is None
+        if outermost:
+            statements = {}  # Distinct SQL in execution order
+            for cursor in cursors:
+                cursor.statements = statements
+        start = time.perf_counter()
+        try:
+            return func(db, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            record(name, elapsed)
+            if outermost:
+                for cursor in cursors:
+                    cursor.statements = None
+                if elapsed * 1000 >= SLOW_QUERY_MS:
+                    _log_slow_query(db.con, name, elapsed, statements)
+    return wrapper
+
+
+def _log_slow_query(con, name, elapsed, statements):
+    entry = {"call": name, "ms": round(elapsed * 1000, 3), "statements": []}
+    for sql, parameters in statements.items():
+        plan = None
+        if sql.lstrip().upper().startswith(("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")):
+            if parameters is None:
+                parameters = [None] * sql.count("?")  # From executemany; NULLs give the same plan
+            try:
+                plan = [row[-1] for row in con.execute("EXPLAIN QUERY PLAN " + sql, parameters)]
+            except Exception as e:  # Plans are best effort; never fail the caller
+                plan = [f"unavailable: {e}"]
+        entry["statements"].append({"sql": sql, "plan": plan})
+    with _lock:
+        if len(slow_queries) < MAX_SLOW_QUERIES:
+            slow_queries.append(entry)
+    count("db.slow_queries")
+    print(f"slow query: {name} took {entry['ms']} ms", file=sys.stderr)
+
+
+def snapshot():
+    with _lock:
+        return {
+            "counters": dict(counters),
+            "timings": {name: histogram.summary() for name, histogram in sorted(histograms.items())},
+            "slow_queries": list(slow_queries),
+        }
+
+
+def dump(path=None):
+    path = path or os.environ.get(FILE_ENV_VAR, "stats.json")
+    with open(path, "w") as f:
+        json.dump(snapshot(), f, indent=2)
+    return path
+
+
+def format_stats(stats=None):
+    stats = stats or snapshot()
+    lines = [f"{'timing':<28} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'total ms':>10}"]
+    for name, t in stats["timings"].items():
+        lines.append(f"{name:<28} {t['count']:>7} {t['p50_ms']:>9.3f} {t['p95_ms']:>9.3f} "
+                     f"{t['p99_ms']:>9.3f} {t['total_ms']:>10.1f}")
+    if stats["counters"]:
+        lines.append("")
+        lines += [f"{name:<28} {value:>7}" for name, value in sorted(stats["counters"].items())]
+    return "\n".join(lines)
+
+
+def show_overlay(root):
+    """Open a window showing live stats, refreshed every OVERLAY_INTERVAL ms."""
+    if not enabled:
+        return None
+    import tkinter as tk  # Only the GUI apps need this
+
+    window = tk.Toplevel(root)
+    window.title("Stats")
+    window.attributes("-topmost", True)
+    label = tk.Label(window, font=("Courier", 10), justify="left", anchor="nw")
+    label.pack(fill="both", expand=True, padx=5, pady=5)
+    tk.Button(window, text="Save JSON", command=lambda: print(f"stats written to {dump()}", file=sys.stderr)).pack(pady=5)
+
+    def refresh():
+        label.config(text=format_stats())
+        window.after(OVERLAY_INTERVAL, refresh)
+
+    refresh()
+    return window
+
+
+if enabled:
+    atexit.register(dump)
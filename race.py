@@ -0,0 +1,201 @@
+"""Race several sorting algorithms on identical copies of one input.
+
+Each (algorithm, order) entry runs in its own worker process, so the
+races do not compete for the GIL.  Workers stream progress counters back
+through a manager queue; Race.poll() collects the latest counters for
+display, either in RaceWindow or on the command line:
+
+    python race.py --size 3000 --distribution random
+"""
+import argparse
+import multiprocessing
+import queue
+import random
+import sys
+import time
+import tkinter as tk
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from tkinter import ttk
+
+import benchmark
+import sorting_engine
+
+CHUNK = 4096  # Steps a worker runs between stop checks and progress reports
+REPORT_INTERVAL = 0.1  # Seconds between progress reports from one worker
+COLUMNS = ("algorithm", "order", "status", "steps", "compares", "swaps", "writes", "elapsed")
+
+
+def all_entries():
+    """Every algorithm in both orders, as (name, ascending) pairs."""
+    return [(name, ascending) for name in sorting_engine.ALGORITHMS for ascending in (True, False)]
+
+
+def _progress(name, ascending, counts, elapsed, status):
+    return {
+        "algorithm": name,
+        "order": "asc" if ascending else "desc",
+        "status": status,
+        "steps": sum(counts),
+        "compares": counts[sorting_engine.COMPARE],
+        "swaps": counts[sorting_engine.SWAP],
+        "writes": counts[sorting_engine.WRITE],
+        "elapsed": round(elapsed, 3),
+    }
+
+
+def race_worker(name, ascending, data, updates, stop):
+    """Sort data with one algorithm, reporting progress to the updates queue."""
+    expected = sorted(data, reverse=not ascending)
+    counts = [0, 0, 0]
+    steps = sorting_engine.get_algorithm(name)(data, ascending)
+    start = last_report = time.perf_counter()
+    while True:
+        taken = 0
+        for op, _, _ in islice(steps, CHUNK):
+            counts[op] += 1
+            taken += 1
+        now = time.perf_counter()
+        if taken < CHUNK:
+            status = "done" if data == expected else "wrong"
+            break
+        if stop.is_set():
+            status = "cancelled"
+            break
+        if now - last_report >= REPORT_INTERVAL:
+            updates.put(_progress(name, ascending, counts, now - start, "running"))
+            last_report = now
+    result = _progress(name, ascending, counts, now - start, status)
+    updates.put(result)
+    return result
+
+
+class Race:
+    def __init__(self, data, entries=None, max_workers=None):
+        """Prepare a race of entries ((name, ascending) pairs) over data."""
+        self.data = list(data)
+        self.entries = list(entries or all_entries())
+        self.max_workers = max_workers
+        self.progress = {}  # (algorithm, order) -> latest progress dict
+        self.futures = []
+        self.pool = None
+        self.manager = None
+
+    def start(self):
+        self.manager = multiprocessing.Manager()
+        self.updates = self.manager.Queue()
+        self.stop_event = self.manager.Event()
+        self.pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        for name, ascending in self.entries:
+            self.progress[(name, "asc" if ascending else "desc")] = _progress(name, ascending, [0, 0, 0], 0, "queued")
+            self.futures.append(self.pool.submit(race_worker, name, ascending, list(self.data), self.updates, self.stop_event))
+
+    def poll(self):
+        """Drain pending progress reports; return the latest one per entry."""
+        while True:
+            try:
+                update = self.updates.get_nowait()
+            except queue.Empty:
+                break
+            key = (update["algorithm"], update["order"])
+            # A final report may overtake a late "running" one.
+            if self.progress[key]["status"] in ("queued", "running"):
+                self.progress[key] = update
+        return list(self.progress.values())
+
+    @property
+    def finished(self):
+        return bool(self.futures) and all(f.done() for f in self.futures)
+
+    def cancel(self):
+        """Ask running workers to stop and drop the ones not started yet."""
+        if self.pool:
+            self.stop_event.set()
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        if self.pool:
+            self.cancel()
+            self.pool.shutdown(wait=True)
+            self.manager.shutdown()
+            self.pool = None
+
+
+class RaceWindow:
+    """Toplevel window showing a live results table for a Race."""
+
+    def __init__(self, root, data, entries=None):
+        self.root = root
+        self.window = tk.Toplevel(root)
+        self.window.title(f"Sorting Race ({len(data)} numbers)")
+        self.window.config(bg="#87CEEB")
+        self.table = ttk.Treeview(self.window, columns=COLUMNS, show="headings", height=20)
+        for column in COLUMNS:
+            self.table.heading(column, text=column.title())
+            self.table.column(column, width=110, anchor="e" if column not in ("algorithm", "order", "status") else "w")
+        self.table.pack(fill="both", expand=True, padx=10, pady=10)
+        self.items = {}
+        self._after_id = None
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        self.race = Race(data, entries)
+        self.race.start()
+        self.refresh()
+
+    def refresh(self):
+        self._after_id = None
+        finished = self.race.finished  # Checked first so the final reports are polled
+        rows = sorted(self.race.poll(), key=lambda p: (p["status"] != "done", p["elapsed"]))
+        for position, row in enumerate(rows):
+            key = (row["algorithm"], row["order"])
+            values = [row[column] for column in COLUMNS]
+            if key not in self.items:
+                self.items[key] = self.table.insert("", "end", values=values)
+            else:
+                self.table.item(self.items[key], values=values)
+            self.table.move(self.items[key], "", position)
+        if finished:
+            self.race.close()
+        else:
+            self._after_id = self.window.after(int(REPORT_INTERVAL * 1000), self.refresh)
+
+    def close(self):
+        if self._after_id is not None:
+            self.window.after_cancel(self._after_id)
+            self._after_id = None
+        self.race.close()
+        self.window.destroy()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Race sorting algorithms in parallel processes.")
+    parser.add_argument("--algorithms", nargs="+", default=list(sorting_engine.ALGORITHMS),
+                        choices=list(sorting_engine.ALGORITHMS))
+    parser.add_argument("--orders", nargs="+", default=["asc", "desc"], choices=("asc", "desc"))
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--distribution", default="random", choices=benchmark.DISTRIBUTIONS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    data = benchmark.make_dataset(args.distribution, args.size, random.Random(args.seed))
+    entries = [(name, order == "asc") for name in args.algorithms for order in args.orders]
+    race = Race(data, entries, max_workers=args.workers)
+    race.start()
+    try:
+        while not race.finished:
+            time.sleep(0.5)
+            running = [p for p in race.poll() if p["status"] == "running"]
+            summary = ", ".join(f"{p['algorithm']}-{p['order']} {p['steps']}" for p in running)
+            print(f"running: {summary or '-'}", file=sys.stderr)
+        rows = sorted(race.poll(), key=lambda p: p["elapsed"])
+    except KeyboardInterrupt:
+        race.cancel()
+        raise
+    finally:
+        race.close()
+    print(benchmark.format_table(rows, COLUMNS))
+    return 0 if all(row["status"] == "done" for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
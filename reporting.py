@@ -0,0 +1,111 @@
+"""Headcount reports for the Employee Management System.
+
+The figures come from summary tables (see employee_db.SUMMARY_SQL) that
+triggers keep current on every insert, update and delete, so a report
+reads one row per group instead of scanning employees.  rebuild()
+recomputes them with GROUP BY queries, and check() compares the two.
+
+    python reporting.py --db Employee.db
+"""
+import argparse
+import sys
+
+from employee_db import REBUILD_SUMMARY_SQL, Database
+
+RECENT_MONTHS = 12  # Months listed by dashboard()
+
+
+def headcount_by_gender(db):
+    """[(gender, headcount)]; gender is None for employees without one."""
+    rows = db.cur.execute("SELECT gender, headcount FROM headcount_by_gender ORDER BY gender").fetchall()
+    return [(gender or None, count) for gender, count in rows]
+
+
+def joins_by_month(db, start=None, end=None, latest=None):
+    """[("YYYY-MM", joins)] in month order, optionally limited to start..end
+    or to the ``latest`` months; employees without a join date are left out."""
+    sql = "SELECT month, joins FROM joins_by_month WHERE month <> ''"
+    params = []
+    if start:
+        sql += " AND month >= ?"
+        params.append(start)
+    if end:
+        sql += " AND month <= ?"
+        params.append(end)
+    if latest:
+        sql += " ORDER BY month DESC LIMIT ?"
+        params.append(latest)
+        return db.cur.execute(sql, params).fetchall()[::-1]
+    return db.cur.execute(sql + " ORDER BY month", params).fetchall()
+
+
+def age_bands(db):
+    """[(band label such as "20-29", headcount)]; "Unknown" for missing ages."""
+    rows = db.cur.execute("SELECT band, headcount FROM headcount_by_age_band ORDER BY band").fetchall()
+    return [(f"{band}-{band + 9}" if band >= 0 else "Unknown", count) for band, count in rows]
+
+
+def dashboard(db):
+    """Everything the app's dashboard panel shows, read from the summaries."""
+    genders = headcount_by_gender(db)
+    return {
+        "total": sum(count for gender, count in genders),
+        "gender": genders,
+        "months": joins_by_month(db, latest=RECENT_MONTHS),
+        "ages": age_bands(db),
+    }
+
+
+def rebuild(db):
+    """Recompute every summary table from employees."""
+    with db.transaction():
+        for sql in REBUILD_SUMMARY_SQL:
+            db.cur.execute(sql)
+
+
+def check(db):
+    """Whether the summaries agree with GROUP BY queries over employees."""
+    queries = [
+        ("headcount_by_gender", "SELECT coalesce(gender, ''), COUNT(*) FROM employees GROUP BY 1"),
+        ("joins_by_month", "SELECT coalesce(substr(doj, 1, 7), ''), COUNT(*) FROM employees GROUP BY 1"),
+        ("headcount_by_age_band", "SELECT coalesce(age / 10 * 10, -1), COUNT(*) FROM employees GROUP BY 1"),
+    ]
+    for table, sql in queries:
+        stored = set(db.cur.execute(f"SELECT * FROM {table}").fetchall())
+        if stored != set(db.cur.execute(sql).fetchall()):
+            return False
+    return True
+
+
+def format_report(report):
+    lines = [f"Employees: {report['total']}", "", "By gender:"]
+    lines += [f"  {gender or 'Unknown':<10} {count:>8}" for gender, count in report["gender"]]
+    lines += ["", "Joins per month:"]
+    lines += [f"  {month:<10} {count:>8}" for month, count in report["months"]]
+    lines += ["", "By age:"]
+    lines += [f"  {band:<10} {count:>8}" for band, count in report["ages"]]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print employee headcount reports.")
+    parser.add_argument("--db", default="Employee.db", help="database file (default Employee.db)")
+    parser.add_argument("--rebuild", action="store_true", help="recompute the summary tables first")
+    parser.add_argument("--check", action="store_true", help="verify the summary tables against the employees")
+    args = parser.parse_args(argv)
+
+    db = Database(args.db)
+    try:
+        if args.rebuild:
+            rebuild(db)
+        if args.check and not check(db):
+            print("Summary tables are out of date; run with --rebuild", file=sys.stderr)
+            return 1
+        print(format_report(dashboard(db)))
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
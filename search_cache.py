@@ -0,0 +1,56 @@
+"""LRU cache of employee search results for search-as-you-type.
+
+Entries are keyed by search text.  A lookup for text that extends a
+cached term (say "jo" after "j") is answered by filtering that term's
+rows with employee_db.search_matches, provided the cached result was
+complete rather than cut off at the search limit.  Terms with no words
+(just punctuation) find nothing under FTS, so they are never refined.
+
+Every write to the table must call invalidate(), which bumps a change
+counter and drops all entries.  Results are stored with the counter value
+from when their query was submitted, so a query that raced a write is
+never cached.
+"""
+from collections import OrderedDict
+
+import instrumentation
+from employee_db import fts_query, search_matches
+
+
+class SearchCache:
+    def __init__(self, capacity=32, fts=True):
+        self.capacity = capacity
+        self.fts = fts
+        self.version = 0  # Change counter; bumped on every insert, update or delete
+        self.entries = OrderedDict()  # text -> (rows, complete), most recent last
+
+    def invalidate(self):
+        self.version += 1
+        self.entries.clear()
+
+    def put(self, text, rows, complete, version=None):
+        """Store rows for text unless the table changed since version."""
+        if version is not None and version != self.version:
+            return
+        self.entries[text] = (rows, complete)
+        self.entries.move_to_end(text)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def get(self, text):
+        """Rows for text from the cache, or None if it must be queried."""
+        if text in self.entries:
+            instrumentation.count("search_cache.hits")
+            self.entries.move_to_end(text)
+            return self.entries[text][0]
+        # Refine the longest complete result for a term that text extends.
+        base = max((term for term, (rows, complete) in self.entries.items()
+                    if complete and text.startswith(term) and (fts_query(term) or not self.fts)),
+                   key=len, default=None)
+        if base is None:
+            instrumentation.count("search_cache.misses")
+            return None
+        instrumentation.count("search_cache.refined")
+        rows = [row for row in self.entries[base][0] if search_matches(row, text, self.fts)]
+        self.put(text, rows, True)
+        return rows
@@ -0,0 +1,458 @@
+"""Headless sorting engine.
+
+Every algorithm is a generator that sorts ``array`` in place and yields a
+step event after each comparison, swap or write.  A step is a plain
+``(op, a, b)`` tuple of ints:
+
+    (COMPARE, i, j)   array[i] and array[j] were compared
+    (SWAP, i, j)      array[i] and array[j] were exchanged
+    (WRITE, i, value) array[i] was overwritten with value
+
+The generators never touch Tk, so they can be drained at full speed for
+benchmarking or consumed one step at a time by the visualizer.
+"""
+import operator
+
+COMPARE = 0
+SWAP = 1
+WRITE = 2
+
+OP_NAMES = ("compare", "swap", "write")
+
+
+def _before(ascending):
+    """Return the predicate telling whether x belongs before y."""
+    return operator.lt if ascending else operator.gt
+
+
+def bubble_sort(array, ascending=True):
+    """Bubble sort."""
+    before = _before(ascending)
+    n = len(array)
+    for i in range(n):
+        for j in range(0, n - i - 1):
+            yield (COMPARE, j, j + 1)
+            if before(array[j + 1], array[j]):
+                array[j], array[j + 1] = array[j + 1], array[j]
+                yield (SWAP, j, j + 1)
+
+
+def selection_sort(array, ascending=True):
+    """Selection sort."""
+    before = _before(ascending)
+    n = len(array)
+    for i in range(n):
+        min_index = i
+        for j in range(i + 1, n):
+            yield (COMPARE, min_index, j)
+            if before(array[j], array[min_index]):
+                min_index = j
+        if min_index != i:
+            array[i], array[min_index] = array[min_index], array[i]
+            yield (SWAP, i, min_index)
+
+
+def insertion_sort(array, ascending=True):
+    """Insertion sort."""
+    before = _before(ascending)
+    for i in range(1, len(array)):
+        key = array[i]
+        j = i - 1
+        while j >= 0:
+            yield (COMPARE, j, j + 1)
+            if not before(key, array[j]):
+                break
+            array[j + 1] = array[j]
+            yield (WRITE, j + 1, array[j])
+            j -= 1
+        if j + 1 != i:
+            array[j + 1] = key
+            yield (WRITE, j + 1, key)
+
+
+def quick_sort(array, ascending=True):
+    """Quick sort with a Lomuto partition on the last element."""
+    # An explicit stack instead of recursion: nested generators hit the
+    # recursion limit on sorted input, where every partition is lopsided.
+    stack = [(0, len(array) - 1)]
+    while stack:
+        low, high = stack.pop()
+        if low < high:
+            pi = yield from _partition(array, low, high, ascending)
+            stack.append((pi + 1, high))
+            stack.append((low, pi - 1))
+
+
+def _partition(array, low, high, ascending):
+    """Partition array[low:high + 1] around array[high]; return the pivot index."""
+    before = _before(ascending)
+    pivot = array[high]
+    i = low - 1
+    for j in range(low, high):
+        yield (COMPARE, j, high)
+        if before(array[j], pivot):
+            i += 1
+            if i != j:
+                array[i], array[j] = array[j], array[i]
+                yield (SWAP, i, j)
+    if i + 1 != high:
+        array[i + 1], array[high] = array[high], array[i + 1]
+        yield (SWAP, i + 1, high)
+    return i + 1
+
+
+def merge_sort(array, ascending=True):
+    """Top-down merge sort."""
+    yield from _merge_sort(array, 0, len(array) - 1, ascending)
+
+
+def _merge_sort(array, left, right, ascending):
+    if left < right:
+        mid = (left + right) // 2
+        yield from _merge_sort(array, left, mid, ascending)
+        yield from _merge_sort(array, mid + 1, right, ascending)
+        yield from _merge(array, left, mid, right, ascending)
+
+
+def _merge(array, left, mid, right, ascending):
+    """Merge the sorted runs array[left:mid + 1] and array[mid + 1:right + 1]."""
+    before = _before(ascending)
+    left_copy = array[left:mid + 1]
+    right_copy = array[mid + 1:right + 1]
+
+    left_index, right_index = 0, 0
+    sorted_index = left
+
+    while left_index < len(left_copy) and right_index < len(right_copy):
+        yield (COMPARE, sorted_index, mid + 1 + right_index)
+        if before(right_copy[right_index], left_copy[left_index]):
+            value = right_copy[right_index]
+            right_index += 1
+        else:
+            value = left_copy[left_index]
+            left_index += 1
+        array[sorted_index] = value
+        yield (WRITE, sorted_index, value)
+        sorted_index += 1
+
+    while left_index < len(left_copy):
+        value = left_copy[left_index]
+        array[sorted_index] = value
+        yield (WRITE, sorted_index, value)
+        left_index += 1
+        sorted_index += 1
+
+    while right_index < len(right_copy):
+        value = right_copy[right_index]
+        array[sorted_index] = value
+        yield (WRITE, sorted_index, value)
+        right_index += 1
+        sorted_index += 1
+
+
+INSERTION_THRESHOLD = 16  # Introsort hands partitions this small to binary insertion
+NINTHER_THRESHOLD = 128  # Partitions at least this large use Tukey's ninther pivot
+
+
+def binary_insertion_sort(array, ascending=True):
+    """Insertion sort that finds each insertion point by binary search."""
+    yield from _binary_insertion(array, 0, len(array) - 1, _before(ascending))
+
+
+def _binary_insertion(array, lo, hi, before, start=None):
+    """Sort array[lo:hi + 1] given that array[lo:start] is already sorted."""
+    for i in range(start if start is not None and start > lo else lo + 1, hi + 1):
+        key = array[i]
+        left, right = lo, i
+        while left < right:  # Rightmost insertion point keeps the sort stable
+            mid = (left + right) // 2
+            yield (COMPARE, i, mid)
+            if before(key, array[mid]):
+                right = mid
+            else:
+                left = mid + 1
+        for k in range(i, left, -1):
+            array[k] = array[k - 1]
+            yield (WRITE, k, array[k])
+        if left != i:
+            array[left] = key
+            yield (WRITE, left, key)
+
+
+def introsort(array, ascending=True):
+    """Quick sort with median-of-three/ninther pivots and three-way partitioning.
+
+    After each partition the loop continues on the smaller side and defers
+    the larger one, so the pending stack stays O(log n).
+    Once a partition exceeds 2 * log2(n) levels it is finished with heap
+    sort, and partitions of INSERTION_THRESHOLD or fewer elements with
+    binary insertion sort.
+    """
+    before = _before(ascending)
+    stack = [(0, len(array) - 1, 2 * len(array).bit_length())]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo + 1 > INSERTION_THRESHOLD and depth:
+            depth -= 1
+            pivot = yield from _choose_pivot(array, lo, hi, before)
+            if pivot != lo:
+                array[lo], array[pivot] = array[pivot], array[lo]
+                yield (SWAP, lo, pivot)
+            lt, gt = yield from _partition3(array, lo, hi, before)
+            if lt - lo < hi - gt:
+                stack.append((gt + 1, hi, depth))
+                hi = lt - 1
+            else:
+                stack.append((lo, lt - 1, depth))
+                lo = gt + 1
+        if hi - lo + 1 > INSERTION_THRESHOLD:
+            yield from _heap_sort(array, lo, hi, before)
+        else:
+            yield from _binary_insertion(array, lo, hi, before)
+
+
+def _median_of_three(array, a, b, c, before):
+    """Return whichever of the indices a, b, c holds the median value."""
+    yield (COMPARE, a, b)
+    if before(array[b], array[a]):
+        a, b = b, a
+    yield (COMPARE, b, c)
+    if not before(array[c], array[b]):
+        return b
+    yield (COMPARE, a, c)
+    return c if before(array[a], array[c]) else a
+
+
+def _choose_pivot(array, lo, hi, before):
+    mid = (lo + hi) // 2
+    if hi - lo + 1 < NINTHER_THRESHOLD:
+        return (yield from _median_of_three(array, lo, mid, hi, before))
+    eighth = (hi - lo) // 8
+    first = yield from _median_of_three(array, lo, lo + eighth, lo + 2 * eighth, before)
+    middle = yield from _median_of_three(array, mid - eighth, mid, mid + eighth, before)
+    last = yield from _median_of_three(array, hi - 2 * eighth, hi - eighth, hi, before)
+    return (yield from _median_of_three(array, first, middle, last, before))
+
+
+def _partition3(array, lo, hi, before):
+    """Dijkstra three-way partition around array[lo].
+
+    Returns (lt, gt) such that array[lt:gt + 1] holds the values equal to
+    the pivot, with smaller values before and larger values after.
+    """
+    pivot = array[lo]
+    lt, i, gt = lo, lo + 1, hi
+    while i <= gt:
+        # array[lt] always holds a copy of the pivot.
+        yield (COMPARE, i, lt)
+        if before(array[i], pivot):
+            array[lt], array[i] = array[i], array[lt]
+            yield (SWAP, lt, i)
+            lt += 1
+            i += 1
+            continue
+        yield (COMPARE, lt, i)
+        if before(pivot, array[i]):
+            if i != gt:
+                array[i], array[gt] = array[gt], array[i]
+                yield (SWAP, i, gt)
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+
+def _heap_sort(array, lo, hi, before):
+    """Heap sort array[lo:hi + 1] (introsort's worst-case fallback)."""
+    n = hi - lo + 1
+    for root in range(n // 2 - 1, -1, -1):
+        yield from _sift_down(array, lo, root, n, before)
+    for end in range(n - 1, 0, -1):
+        array[lo], array[lo + end] = array[lo + end], array[lo]
+        yield (SWAP, lo, lo + end)
+        yield from _sift_down(array, lo, 0, end, before)
+
+
+def _sift_down(array, lo, root, size, before):
+    """Restore the heap property below root within array[lo:lo + size]."""
+    while True:
+        child = 2 * root + 1
+        if child >= size:
+            return
+        if child + 1 < size:
+            yield (COMPARE, lo + child, lo + child + 1)
+            if before(array[lo + child], array[lo + child + 1]):
+                child += 1
+        yield (COMPARE, lo + root, lo + child)
+        if not before(array[lo + root], array[lo + child]):
+            return
+        array[lo + root], array[lo + child] = array[lo + child], array[lo + root]
+        yield (SWAP, lo + root, lo + child)
+        root = child
+
+
+def bottom_up_merge_sort(array, ascending=True):
+    """Iterative merge sort of doubling run widths with one auxiliary buffer."""
+    before = _before(ascending)
+    n = len(array)
+    aux = [None] * n
+    width = 1
+    while width < n:
+        for lo in range(0, n - width, 2 * width):
+            yield from _merge_runs(array, aux, lo, lo + width, min(lo + 2 * width, n), before)
+        width *= 2
+
+
+def _merge_runs(array, aux, lo, mid, hi, before):
+    """Merge sorted array[lo:mid] and array[mid:hi], buffering the left run in aux."""
+    yield (COMPARE, mid - 1, mid)
+    if not before(array[mid], array[mid - 1]):
+        return  # Already in order
+    for k in range(lo, mid):
+        aux[k] = array[k]
+    i, j, k = lo, mid, lo
+    while i < mid and j < hi:
+        yield (COMPARE, k, j)
+        if before(array[j], aux[i]):
+            value = array[j]
+            j += 1
+        else:
+            value = aux[i]
+            i += 1
+        array[k] = value
+        yield (WRITE, k, value)
+        k += 1
+    # Whatever remains of the right run is already in place.
+    while i < mid:
+        value = aux[i]
+        array[k] = value
+        yield (WRITE, k, value)
+        i += 1
+        k += 1
+
+
+def natural_merge_sort(array, ascending=True):
+    """Timsort-style merge sort over the input's natural runs.
+
+    Existing ascending runs are kept, strictly descending runs are
+    reversed in place, and short runs are extended to a minimum length
+    with binary insertion sort.  Runs are merged under Timsort's stack
+    invariants so merges stay balanced.
+    """
+    before = _before(ascending)
+    n = len(array)
+    aux = [None] * n
+    min_run = _min_run_length(n)
+    runs = []  # [start, length] of pending runs, bottom of the stack first
+    lo = 0
+    while lo < n:
+        length = yield from _count_run(array, lo, n, before)
+        if length < min_run:
+            forced = min(min_run, n - lo)
+            yield from _binary_insertion(array, lo, lo + forced - 1, before, start=lo + length)
+            length = forced
+        runs.append([lo, length])
+        yield from _merge_collapse(array, aux, runs, before)
+        lo += length
+    while len(runs) > 1:
+        yield from _merge_at(array, aux, runs, len(runs) - 2, before)
+
+
+def _min_run_length(n):
+    """Timsort's minimum run length: n / 2**k rounded up, in [32, 64]."""
+    extra = 0
+    while n >= 64:
+        extra |= n & 1
+        n >>= 1
+    return n + extra
+
+
+def _count_run(array, lo, n, before):
+    """Return the length of the run starting at lo, reversing it if descending."""
+    if lo + 1 == n:
+        return 1
+    hi = lo + 1
+    yield (COMPARE, lo, hi)
+    if before(array[hi], array[lo]):
+        while hi + 1 < n:
+            yield (COMPARE, hi, hi + 1)
+            if not before(array[hi + 1], array[hi]):
+                break
+            hi += 1
+        i, j = lo, hi
+        while i < j:
+            array[i], array[j] = array[j], array[i]
+            yield (SWAP, i, j)
+            i += 1
+            j -= 1
+    else:
+        while hi + 1 < n:
+            yield (COMPARE, hi, hi + 1)
+            if before(array[hi + 1], array[hi]):
+                break
+            hi += 1
+    return hi - lo + 1
+
+
+def _merge_collapse(array, aux, runs, before):
+    """Merge pending runs until Timsort's length invariants hold again."""
+    while len(runs) > 1:
+        i = len(runs) - 2
+        if (i > 0 and runs[i - 1][1] <= runs[i][1] + runs[i + 1][1]) or \
+                (i > 1 and runs[i - 2][1] <= runs[i - 1][1] + runs[i][1]):
+            if runs[i - 1][1] < runs[i + 1][1]:
+                i -= 1
+        elif runs[i][1] > runs[i + 1][1]:
+            return
+        yield from _merge_at(array, aux, runs, i, before)
+
+
+def _merge_at(array, aux, runs, i, before):
+    """Merge pending runs i and i + 1."""
+    lo, left = runs[i]
+    right = runs[i + 1][1]
+    yield from _merge_runs(array, aux, lo, lo + left, lo + left + right, before)
+    runs[i][1] = left + right
+    del runs[i + 1]
+
+
+# Algorithm name -> (label shown in the UI, generator function)
+ALGORITHMS = {
+    "bubble": ("Bubble Sort", bubble_sort),
+    "selection": ("Selection Sort", selection_sort),
+    "quick": ("Quick Sort", quick_sort),
+    "merge": ("Merge Sort", merge_sort),
+    "insertion": ("Insertion Sort", insertion_sort),
+    "binary_insertion": ("Binary Insertion", binary_insertion_sort),
+    "introsort": ("Introsort", introsort),
+    "bottom_up_merge": ("Bottom-up Merge", bottom_up_merge_sort),
+    "natural_merge": ("Natural Merge", natural_merge_sort),
+}
+
+
+def get_algorithm(name):
+    """Look up an algorithm generator by name."""
+    try:
+        return ALGORITHMS[name][1]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm {name!r}; choose from {', '.join(ALGORITHMS)}") from None
+
+
+def apply_step(array, step):
+    """Replay a SWAP or WRITE step onto another copy of the array."""
+    op, a, b = step
+    if op == SWAP:
+        array[a], array[b] = array[b], array[a]
+    elif op == WRITE:
+        array[a] = b
+
+
+def run(name, array, ascending=True):
+    """Sort array in place with the named algorithm at full speed.
+
+    Returns a ``[compares, swaps, writes]`` list of step counts.
+    """
+    counts = [0, 0, 0]
+    for op, _, _ in get_algorithm(name)(array, ascending):
+        counts[op] += 1
+    return counts
@@ -0,0 +1,335 @@
+"""Compact recording and replay of sorting step streams.
+
+A StepTrace stores a run's steps in parallel typed arrays (opcode, first
+index, second index or written value, overwritten value) instead of one
+tuple per step, plus periodic snapshots of the array contents.  Keeping
+the overwritten value makes every step reversible in O(1), and seeking
+to any step starts from the nearest earlier snapshot, so it costs at most
+``snapshot_interval`` step applications.
+
+Traces are saved as a small header followed by the zlib-compressed
+arrays; snapshots are rebuilt on load.  ReplayWindow plays a trace back
+on the visualizer's renderer with scrubbing, reverse playback and
+jumping to a step number.
+"""
+import struct
+import sys
+import tkinter as tk
+import zlib
+from array import array
+
+import sorting_engine
+from animation import AnimationScheduler
+from sorting_engine import COMPARE, SWAP, WRITE
+
+MAGIC = b"STRC"
+VERSION = 1
+HEADER = struct.Struct("<4sHBBIQQ")  # magic, version, ascending, truncated, name length, size, steps
+DEFAULT_SNAPSHOT_INTERVAL = 4096
+
+
+class StepTrace:
+    def __init__(self, initial, name="", ascending=True, snapshot_interval=None):
+        self.name = name
+        self.ascending = ascending
+        self.initial = array("q", initial)
+        # Snapshots cost len(initial) values each, so keep them no denser
+        # than one per len(initial) steps; memory stays O(steps).
+        self.snapshot_interval = snapshot_interval or max(DEFAULT_SNAPSHOT_INTERVAL, len(initial))
+        self.ops = array("b")
+        self.first = array("q")
+        self.second = array("q")
+        self.overwritten = array("q")
+        self.snapshots = [array("q", initial)]  # snapshots[k] = state after k * interval steps
+        self._state = list(initial)
+        self.truncated = False
+
+    def __len__(self):
+        return len(self.ops)
+
+    @classmethod
+    def record(cls, name, values, ascending=True, snapshot_interval=None):
+        """Run the named engine algorithm on a copy of values and record it."""
+        trace = cls(values, name, ascending, snapshot_interval)
+        for _ in trace.wrap(sorting_engine.get_algorithm(name)(list(values), ascending)):
+            pass
+        return trace
+
+    def wrap(self, steps, limit=None):
+        """Yield steps unchanged while appending each one to the trace.
+
+        With a ``limit``, recording stops after that many steps (the trace
+        keeps the prefix and ``truncated`` is set) but steps still flow.
+        """
+        for step in steps:
+            if limit is None or len(self.ops) < limit:
+                self.append(step)
+            else:
+                self.truncated = True
+            yield step
+
+    def append(self, step):
+        op, a, b = step
+        state = self._state
+        old = 0
+        if op == SWAP:
+            state[a], state[b] = state[b], state[a]
+        elif op == WRITE:
+            old = state[a]
+            state[a] = b
+        self.ops.append(op)
+        self.first.append(a)
+        self.second.append(b)
+        self.overwritten.append(old)
+        if not len(self.ops) % self.snapshot_interval:
+            self.snapshots.append(array("q", state))
+
+    def step(self, index):
+        """Return step number index as an (op, a, b) tuple."""
+        return (self.ops[index], self.first[index], self.second[index])
+
+    def save(self, path):
+        name = self.name.encode()
+        payload = b"".join(_little_endian(part) for part in
+                           (self.initial, self.ops, self.first, self.second, self.overwritten))
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.ascending, self.truncated, len(name),
+                                len(self.initial), len(self.ops)))
+            f.write(name)
+            f.write(zlib.compress(payload, 6))
+
+    @classmethod
+    def load(cls, path, snapshot_interval=None):
+        """Read a trace written by save(); raise ValueError if it is not a valid one."""
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"{path} is not a version {VERSION} step trace")
+            magic, version, ascending, truncated, name_length, size, steps = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} step trace")
+            name = f.read(name_length)
+            if len(name) < name_length:
+                raise ValueError(f"{path} is damaged (it is cut short)")
+            try:
+                payload = memoryview(zlib.decompress(f.read()))
+            except zlib.error as e:
+                raise ValueError(f"{path} is damaged ({e})") from None
+        name = name.decode(errors="replace")
+        parts = []
+        for typecode, count in (("q", size), ("b", steps), ("q", steps), ("q", steps), ("q", steps)):
+            part = array(typecode)
+            nbytes = part.itemsize * count
+            if len(payload) < nbytes:
+                raise ValueError(f"{path} is damaged (it holds fewer values than its header says)")
+            part.frombytes(payload[:nbytes])
+            payload = payload[nbytes:]
+            if sys.byteorder == "big":
+                part.byteswap()
+            parts.append(part)
+        initial, ops, first, second, overwritten = parts
+        for op, a, b in zip(ops, first, second):
+            if op not in (COMPARE, SWAP, WRITE) or not 0 <= a < size or (op != WRITE and not 0 <= b < size):
+                raise ValueError(f"{path} is damaged (a step is outside its {size} values)")
+        trace = cls(initial, name, bool(ascending), snapshot_interval)
+        trace.ops, trace.first, trace.second, trace.overwritten = ops, first, second, overwritten
+        trace.truncated = bool(truncated)
+        trace._rebuild_snapshots()
+        return trace
+
+    def _rebuild_snapshots(self):
+        state = list(self.initial)
+        self.snapshots = [array("q", state)]
+        interval = self.snapshot_interval
+        for index in range(len(self.ops)):
+            op = self.ops[index]
+            if op == SWAP:
+                a, b = self.first[index], self.second[index]
+                state[a], state[b] = state[b], state[a]
+            elif op == WRITE:
+                state[self.first[index]] = self.second[index]
+            if not (index + 1) % interval:
+                self.snapshots.append(array("q", state))
+        self._state = state
+
+
+def _little_endian(part):
+    if sys.byteorder == "big":
+        part = array(part.typecode, part)
+        part.byteswap()
+    return part.tobytes()
+
+
+class TracePlayer:
+    """Replays a StepTrace onto its own array, forwards, backwards or by seeking."""
+
+    def __init__(self, trace):
+        self.trace = trace
+        self.array = list(trace.initial)
+        self.position = 0  # Number of steps applied to self.array
+
+    def forward(self):
+        """Apply the next step and return it, or None at the end."""
+        trace = self.trace
+        if self.position >= len(trace):
+            return None
+        step = trace.step(self.position)
+        sorting_engine.apply_step(self.array, step)
+        self.position += 1
+        return step
+
+    def backward(self):
+        """Undo the last applied step and return it, or None at the start."""
+        if self.position == 0:
+            return None
+        self.position -= 1
+        trace = self.trace
+        index = self.position
+        op, a, b = trace.step(index)
+        if op == SWAP:
+            self.array[a], self.array[b] = self.array[b], self.array[a]
+        elif op == WRITE:
+            self.array[a] = trace.overwritten[index]
+            return (WRITE, a, trace.overwritten[index])
+        return (op, a, b)
+
+    def seek(self, position):
+        """Jump to the state after position steps in O(snapshot interval)."""
+        position = max(0, min(position, len(self.trace)))
+        interval = self.trace.snapshot_interval
+        if not (self.position <= position < self.position + interval or
+                position <= self.position < position + interval):
+            # Far away: restart from the nearest snapshot at or before it.
+            self.array[:] = self.trace.snapshots[position // interval]
+            self.position = position // interval * interval
+        while self.position < position:
+            self.forward()
+        while self.position > position:
+            self.backward()
+
+    def steps_forward(self):
+        """Generator of steps for continuous forward playback."""
+        while True:
+            step = self.forward()
+            if step is None:
+                return
+            yield step
+
+    def steps_backward(self):
+        """Generator of steps for continuous reverse playback."""
+        while True:
+            step = self.backward()
+            if step is None:
+                return
+            yield step
+
+
+class ReplayWindow:
+    """Toplevel playback controls for replaying a trace on a renderer."""
+
+    def __init__(self, root, trace, renderer, delay=100, on_close=None):
+        self.trace = trace
+        self.renderer = renderer
+        self.delay = delay
+        self.on_close = on_close
+        self.player = TracePlayer(trace)
+        self.animation = None
+
+        self.window = tk.Toplevel(root)
+        steps = f"{len(trace)} steps, truncated" if trace.truncated else f"{len(trace)} steps"
+        self.window.title(f"Replay: {trace.name or 'trace'} ({steps})")
+        self.window.config(bg="#87CEEB")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.scale = tk.Scale(self.window, from_=0, to=len(trace), orient="horizontal", length=600,
+                              showvalue=False, command=self.on_scrub, bg="#87CEEB", highlightthickness=0)
+        self.scale.pack(padx=10, pady=5)
+        self.position_label = tk.Label(self.window, font=("Helvetica", 10), bg="#87CEEB")
+        self.position_label.pack()
+
+        controls = tk.Frame(self.window, bg="#87CEEB")
+        controls.pack(pady=5)
+        buttons = [
+            ("Reverse", lambda: self.play(forward=False)),
+            ("Step Back", lambda: self.step(forward=False)),
+            ("Pause", self.pause),
+            ("Step", lambda: self.step(forward=True)),
+            ("Play", lambda: self.play(forward=True)),
+        ]
+        for index, (text, command) in enumerate(buttons):
+            tk.Button(controls, text=text, command=command, font=("Helvetica", 10, "bold")).grid(row=0, column=index, padx=3)
+        self.jump_entry = tk.Entry(controls, width=10)
+        self.jump_entry.grid(row=0, column=len(buttons), padx=3)
+        tk.Button(controls, text="Go to Step", command=self.jump, font=("Helvetica", 10, "bold")).grid(row=0, column=len(buttons) + 1, padx=3)
+
+        self.renderer.load(self.player.array)
+        self.update_position()
+
+    def play(self, forward=True):
+        self.pause()
+        steps = self.player.steps_forward() if forward else self.player.steps_backward()
+        self.animation = AnimationScheduler(self.window, steps, on_step=self.on_step,
+                                            on_frame=self.on_frame, delay=self.delay)
+        self.animation.start()
+
+    def pause(self):
+        if self.animation:
+            self.animation.stop()
+            self.animation = None
+
+    def step(self, forward=True):
+        self.pause()
+        step = self.player.forward() if forward else self.player.backward()
+        if step:
+            self.on_step(step)
+        self.on_frame()
+
+    def set_delay(self, delay):
+        self.delay = delay
+        if self.animation:
+            self.animation.set_delay(delay)
+
+    def seek(self, position):
+        """Show the state after position steps."""
+        self.pause()
+        self.player.seek(position)
+        self.renderer.mark_all()
+        self.renderer.highlight(())
+        self.on_frame()
+
+    def jump(self):
+        try:
+            position = int(self.jump_entry.get())
+        except ValueError:
+            return
+        self.seek(position)
+
+    def on_scrub(self, value):
+        if int(value) != self.player.position:  # Not just the slider following playback
+            self.seek(int(value))
+
+    def on_step(self, step):
+        op, a, b = step
+        if op == COMPARE:
+            self.renderer.highlight((a, b))
+        else:
+            self.renderer.mark(a)
+            if op == SWAP:
+                self.renderer.mark(b)
+
+    def on_frame(self):
+        self.renderer.flush()
+        self.update_position()
+
+    def update_position(self):
+        self.scale.set(self.player.position)
+        text = f"Step {self.player.position} / {len(self.trace)}"
+        if self.trace.truncated:
+            text += " (truncated; the sort ran longer)"
+        self.position_label.config(text=text)
+
+    def close(self):
+        self.pause()
+        self.window.destroy()
+        if self.on_close:
+            self.on_close()